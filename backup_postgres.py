@@ -59,7 +59,7 @@ def backup_stats():
     
     try:
         logger = ConversationLogger(database_url=database_url)
-        stats = logger.get_stats()
+        stats = logger.get_stats(exact=True)
         
         print("=" * 70)
         print("Database Statistics")
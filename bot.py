@@ -9,7 +9,11 @@ import discord
 from discord.ext import commands
 import os
 import sys
+import io
 import json
+import logging
+import logging.handlers
+import queue
 import asyncio
 import sqlite3
 import time
@@ -214,7 +218,8 @@ class AIBootBot(commands.Bot):
             analytics_enabled = self.config.get("analytics_enabled", True)
             if analytics_enabled:
                 self.analytics_tracker = AnalyticsTracker(
-                    db_path="analytics.db")
+                    db_path="analytics.db",
+                    store_bodies=self.config.get("analytics_store_bodies", False))
                 print("[OK] Analytics Tracker initialized")
         except Exception as e:
             print(f"[WARNING] Analytics Tracker not available: {e}")
@@ -413,6 +418,14 @@ class AIBootBot(commands.Bot):
         except Exception as e:
             print(f"[WARNING] Could not start backup scheduler: {e}")
 
+        # Start weekly analytics database maintenance
+        if self.analytics_tracker:
+            asyncio.create_task(self._analytics_maintenance_scheduler())
+
+        # Start hourly PostgreSQL conversation statistics refresh
+        if self.conversation_logger and self.conversation_logger.use_postgres:
+            asyncio.create_task(self._conversation_stats_scheduler())
+
         # Reset monthly budget alerts if it's a new month
         if self.statistics_tracker:
             try:
@@ -1597,6 +1610,14 @@ class AIBootBot(commands.Bot):
         except Exception as e:
             print(f"[WARNING] Could not start backup scheduler: {e}")
 
+        # Start weekly analytics database maintenance
+        if self.analytics_tracker:
+            asyncio.create_task(self._analytics_maintenance_scheduler())
+
+        # Start hourly PostgreSQL conversation statistics refresh
+        if self.conversation_logger and self.conversation_logger.use_postgres:
+            asyncio.create_task(self._conversation_stats_scheduler())
+
         # Reset monthly budget alerts if it's a new month
         if self.statistics_tracker:
             try:
@@ -2551,7 +2572,9 @@ class AIBootBot(commands.Bot):
                     # Log conversation to permanent database
                     if self.conversation_logger:
                         try:
-                            self.conversation_logger.log_conversation(
+                            # May flush a full batch, so keep it off the event loop
+                            await asyncio.to_thread(
+                                self.conversation_logger.log_conversation,
                                 user_id=str(message.author.id),
                                 user_name=message.author.display_name,
                                 channel_id=str(message.channel.id),
@@ -2591,20 +2614,8 @@ class AIBootBot(commands.Bot):
                 # Check if response was already sent by checking if exception happened after response
                 try:
                     # Try fallback response using keyword matching
-                    # Detect language for fallback
-                    detected_lang = 'en'
-                    kurdish_dial = None
-                    if KURDISH_DETECTOR_AVAILABLE:
-                        lang_result = KurdishDetector.detect_language(
-                            message.content)
-                        detected_lang = lang_result[0]
-                        if detected_lang == 'ku':
-                            kurdish_result = KurdishDetector.detect_kurdish(
-                                message.content)
-                            if kurdish_result:
-                                kurdish_dial, _ = kurdish_result
-                    fallback = find_response(
-                        message.content, detected_lang, kurdish_dial)
+                    # (find_response detects the language itself, cached)
+                    fallback = find_response(message.content)
                     if EMBED_HELPER_AVAILABLE:
                         embed = EmbedHelper.create_ai_response_embed(
                             content=fallback,
@@ -2971,12 +2982,16 @@ class AIBootBot(commands.Bot):
                     await ctx.send("📊 Exporting conversations to CSV... This may take a moment.")
 
                 filename = f"conversation_export_{timestamp}.csv"
-                filepath = self.conversation_logger.export_to_csv(
-                    output_path=filename)
+                # Build the CSV in memory instead of writing and re-reading a file
+                buffer = io.BytesIO()
+                await asyncio.to_thread(
+                    self.conversation_logger.export_to_csv,
+                    output_path=filename, file_obj=buffer)
+                buffer.seek(0)
 
                 # Send file to Discord
-                with open(filepath, 'rb') as f:
-                    file = discord.File(f, filename=filename)
+                with buffer:
+                    file = discord.File(buffer, filename=filename)
                     if EMBED_HELPER_AVAILABLE:
                         embed = EmbedHelper.create_success_embed(
                             title="✅ Export Complete",
@@ -2992,7 +3007,7 @@ class AIBootBot(commands.Bot):
                             file=file
                         )
 
-                print(f"[OK] Exported conversations to {filepath}")
+                print(f"[OK] Sent conversation export to Discord as {filename}")
         except Exception as e:
             if EMBED_HELPER_AVAILABLE:
                 embed = EmbedHelper.create_error_embed(
@@ -3912,7 +3927,8 @@ class AIBootBot(commands.Bot):
                 user_id = str(ctx.author.id)
 
             # Get history
-            history = self.conversation_logger.get_user_history(
+            history = await asyncio.to_thread(
+                self.conversation_logger.get_user_history,
                 user_id=user_id,
                 user_name=user_name,
                 limit=10
@@ -5980,6 +5996,46 @@ class AIBootBot(commands.Bot):
                 print(f"[ERROR] Backup scheduler error: {e}")
                 await asyncio.sleep(3600)  # Wait 1 hour before retrying
 
+    async def _analytics_maintenance_scheduler(self):
+        # Weekly analytics database maintenance (Sundays at 3 AM)
+        while True:
+            try:
+                now = datetime.now()
+                next_run = now.replace(
+                    hour=3, minute=0, second=0, microsecond=0)
+                next_run += timedelta(days=(6 - now.weekday()) % 7)
+                if next_run <= now:
+                    next_run += timedelta(days=7)
+
+                await asyncio.sleep((next_run - now).total_seconds())
+
+                result = await self.analytics_tracker.maintenance()
+                print(
+                    f"[OK] Analytics maintenance done ({result['free_pages']}/{result['page_count']} free pages, vacuumed: {result['vacuumed']})")
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[ERROR] Analytics maintenance error: {e}")
+                await asyncio.sleep(3600)  # Wait 1 hour before retrying
+
+    async def _conversation_stats_scheduler(self):
+        # Hourly ANALYZE of a partitioned PostgreSQL conversations table, so
+        # /stats user estimates stay current (autovacuum never analyzes the
+        # partitioned parent). Runs once at startup, then every hour
+        while True:
+            try:
+                if not await asyncio.to_thread(self.conversation_logger.analyze):
+                    break  # Plain table: autovacuum keeps its statistics
+
+                await asyncio.sleep(3600)
+
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                print(f"[ERROR] Conversation statistics refresh error: {e}")
+                await asyncio.sleep(3600)  # Wait 1 hour before retrying
+
     async def _perform_backup(self, automatic: bool = False) -> Dict:
         # Perform database backup. Args: automatic (bool). Returns: Backup result dictionary
         try:
@@ -6418,11 +6474,33 @@ class AIBootBot(commands.Bot):
             except Exception as e:
                 print(f"[ERROR] Error stopping webhook server: {e}")
 
+        # Close the analytics database connection
+        if self.analytics_tracker:
+            try:
+                await self.analytics_tracker.close()
+            except Exception as e:
+                print(f"[ERROR] Error closing analytics database: {e}")
+
         await super().close()
 
 
 # End of AIBootBot class
 
+def _setup_logging() -> logging.handlers.QueueListener:
+    """Send stdlib logging through a queue so stream writes happen off the event loop"""
+    log_queue = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("[%(levelname)s] %(name)s: %(message)s"))
+
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
 async def main():
     # Main function to run the bot
     # Get Discord token from environment
@@ -6434,6 +6512,8 @@ async def main():
         print("Example: DISCORD_TOKEN=your_token_here")
         return
 
+    log_listener = _setup_logging()
+
     # Create and run bot
     bot = AIBootBot()
 
@@ -6447,8 +6527,10 @@ async def main():
         import traceback
         traceback.print_exc()
         await bot.close()
+        log_listener.stop()
         # Exit with error code for Railway to restart
         os._exit(1)
+    log_listener.stop()
 
 
 if __name__ == "__main__":
@@ -5,7 +5,7 @@ Conversation Cog - Handles natural conversations and mentions
 import discord
 from discord.ext import commands
 import asyncio
-from typing import Optional, Dict
+from typing import Awaitable, Callable, Optional, Dict
 import json
 import os
 from datetime import datetime, timedelta
@@ -18,6 +18,9 @@ from utils.image_analyzer import ImageAnalyzer
 from utils.moderation import Moderation
 from utils.web_search import WebSearch
 
+# Minimum seconds between edits of a streaming reply (Discord rate-limits edits)
+STREAM_EDIT_INTERVAL = 1.0
+
 
 class Conversation(commands.Cog):
     """Handles conversation interactions with the bot"""
@@ -98,7 +101,8 @@ class Conversation(commands.Cog):
         channel_id: int,
         user_message: str,
         user_id: int,
-        server_id: Optional[int] = None
+        server_id: Optional[int] = None,
+        on_partial: Optional[Callable[[str], Awaitable[None]]] = None
     ) -> str:
         """
         Generate AI response for user message
@@ -108,6 +112,8 @@ class Conversation(commands.Cog):
             user_message: User's message content
             user_id: User's Discord ID
             server_id: Optional server ID for preferences
+            on_partial: Optional callback that streams the response; it is
+                awaited with the text so far, at most every STREAM_EDIT_INTERVAL
             
         Returns:
             Generated response text
@@ -128,10 +134,24 @@ class Conversation(commands.Cog):
         context = self.context_manager.get_context(channel_id)
         
         # Generate response
-        response = await self.api_handler.generate_response(
-            messages=context,
-            personality=personality
-        )
+        if on_partial is None:
+            response = await self.api_handler.generate_response(
+                messages=context,
+                personality=personality
+            )
+        else:
+            loop = asyncio.get_running_loop()
+            parts = []
+            last_update = loop.time()
+            async for text in self.api_handler.generate_response_stream(
+                messages=context,
+                personality=personality
+            ):
+                parts.append(text)
+                if loop.time() - last_update >= STREAM_EDIT_INTERVAL:
+                    await on_partial("".join(parts))
+                    last_update = loop.time()
+            response = "".join(parts).strip()
         
         # Add bot response to context (will auto-summarize if needed)
         await self.context_manager.add_message(
@@ -241,7 +261,17 @@ class Conversation(commands.Cog):
                             )
                             content += f"\n[User sent an image: {image_description}]"
                 
-                # Generate response
+                # Generate response, showing it in the reply as it streams in
+                reply = None
+                
+                async def show_partial(text: str):
+                    nonlocal reply
+                    embed = self._build_response_embed(message, text, image_description)
+                    if reply is None:
+                        reply = await message.reply(embed=embed)
+                    else:
+                        await reply.edit(embed=embed)
+                
                 if use_web_search and self.web_search:
                     response = await self.web_search.search_and_summarize(content, self.api_handler)
                 else:
@@ -249,7 +279,8 @@ class Conversation(commands.Cog):
                         channel_id=message.channel.id,
                         user_message=content,
                         user_id=message.author.id,
-                        server_id=server_id
+                        server_id=server_id,
+                        on_partial=show_partial
                     )
                 
                 # Save to database
@@ -262,30 +293,12 @@ class Conversation(commands.Cog):
                     )
                     await self.database.increment_stat(server_id, message.channel.id, "message")
                 
-                # Create embed response
-                embed = discord.Embed(
-                    description=response,
-                    color=discord.Color.blue()
-                )
-                embed.set_author(
-                    name=message.author.display_name,
-                    icon_url=message.author.display_avatar.url
-                )
-                
-                if image_description:
-                    embed.add_field(
-                        name="🖼️ Image Analysis",
-                        value=image_description[:1024],
-                        inline=False
-                    )
-                
-                # Truncate if too long
-                max_length = self.bot.config.get("max_message_length", 2000)
-                if len(response) > max_length:
-                    embed.description = response[:max_length-3] + "..."
-                
-                # Send response
-                await message.reply(embed=embed)
+                # Send response (or finish the streamed one)
+                embed = self._build_response_embed(message, response, image_description)
+                if reply is None:
+                    await message.reply(embed=embed)
+                else:
+                    await reply.edit(embed=embed)
                 
                 # Log conversation if enabled
                 if self.bot.config.get("enable_logging", True):
@@ -303,6 +316,46 @@ class Conversation(commands.Cog):
                 if self.bot.config.get("enable_logging", True):
                     self._log_error(message, str(e))
     
+    def _build_response_embed(
+        self,
+        message: discord.Message,
+        response: str,
+        image_description: Optional[str] = None
+    ) -> discord.Embed:
+        """
+        Build the reply embed for a response
+        
+        Args:
+            message: Message being replied to
+            response: Response text
+            image_description: Optional analysis of an attached image
+            
+        Returns:
+            Reply embed
+        """
+        embed = discord.Embed(
+            description=response,
+            color=discord.Color.blue()
+        )
+        embed.set_author(
+            name=message.author.display_name,
+            icon_url=message.author.display_avatar.url
+        )
+        
+        if image_description:
+            embed.add_field(
+                name="🖼️ Image Analysis",
+                value=image_description[:1024],
+                inline=False
+            )
+        
+        # Truncate if too long
+        max_length = self.bot.config.get("max_message_length", 2000)
+        if len(response) > max_length:
+            embed.description = response[:max_length-3] + "..."
+        
+        return embed
+    
     async def _handle_image(self, message: discord.Message, attachment: discord.Attachment):
         """
         Handle image analysis when user sends image
@@ -12,9 +12,83 @@ import asyncio
 try:
     from utils.embed_helper import EmbedHelper, EmbedColors
     EMBED_HELPER_AVAILABLE = True
+    # Bind embed colors once instead of looking them up on every command
+    _COLOR_KURDISH = EmbedColors.KURDISH
+    _COLOR_PRIMARY = EmbedColors.PRIMARY
+    _COLOR_WARNING = EmbedColors.WARNING
+    _COLOR_SUCCESS = EmbedColors.SUCCESS
+    _COLOR_INFO = EmbedColors.INFO
+    _create_info_embed = EmbedHelper.create_info_embed
 except ImportError:
     EMBED_HELPER_AVAILABLE = False
 
+# System prompts for AI-generated fun content, shared across calls
+_JOKE_SYSTEM = "You are a friendly comedian. Tell clean, family-friendly jokes that are funny and appropriate."
+_STORY_SYSTEM = "You are a creative storyteller. Write engaging, imaginative stories that captivate readers."
+_TRIVIA_SYSTEM = "You are a trivia master. Generate engaging trivia questions with multiple choice answers."
+_JOKE_MESSAGES = ({"role": "user", "content": "Tell me a funny joke. Keep it clean and appropriate for Discord."},)
+
+# Fallback messages sent when AI generation is unavailable
+_STORY_ERROR = "I'm having trouble generating a story right now. Please try again later!"
+_TRIVIA_ERROR = "I'm having trouble generating trivia right now. Please try again later!"
+
+# Plain-text prefixes used when EmbedHelper is unavailable
+_JOKE_PREFIX = "😄 **Joke**\n\n"
+_FACT_PREFIX = "💡 **Did You Know?**\n\n"
+_QUOTE_PREFIX = "💬 **Quote**\n\n"
+
+# Module-level RNG and static pools, built once instead of per command call
+_rng = random.Random()
+
+_JOKES = (
+    "Why don't scientists trust atoms? Because they make up everything!",
+    "Why did the scarecrow win an award? He was outstanding in his field!",
+    "What do you call a fake noodle? An impasta!",
+    "Why don't eggs tell jokes? They'd crack each other up!",
+    "What's the best thing about Switzerland? I don't know, but the flag is a big plus!"
+)
+
+_RIDDLES = (
+    {"q": "I speak without a mouth and hear without ears. I have no body, but I come alive with wind. What am I?", "a": "echo"},
+    {"q": "The more you take, the more you leave behind. What am I?", "a": "footsteps"},
+    {"q": "I have cities, but no houses. I have mountains, but no trees. I have water, but no fish. What am I?", "a": "map"},
+    {"q": "What has keys but no locks, space but no room, and you can enter but not go inside?", "a": "keyboard"},
+    {"q": "I'm tall when I'm young, and short when I'm old. What am I?", "a": "candle"}
+)
+
+# Exactly 8 entries so a 3-bit draw indexes it directly
+_FACTS = (
+    "Honey never spoils. Archaeologists have found 3000-year-old honey that's still edible!",
+    "Octopuses have three hearts and blue blood.",
+    "A group of flamingos is called a 'flamboyance'.",
+    "Bananas are berries, but strawberries aren't!",
+    "Sharks have been around longer than trees.",
+    "A day on Venus is longer than its year.",
+    "Wombat poop is cube-shaped!",
+    "There are more possible games of chess than atoms in the observable universe."
+)
+
+_QUOTES = (
+    "The only way to do great work is to love what you do. - Steve Jobs",
+    "Innovation distinguishes between a leader and a follower. - Steve Jobs",
+    "The future belongs to those who believe in the beauty of their dreams. - Eleanor Roosevelt",
+    "It is during our darkest moments that we must focus to see the light. - Aristotle",
+    "Success is not final, failure is not fatal: it is the courage to continue that counts. - Winston Churchill"
+)
+
+
+# Trivia prefetch: keep a couple of generated quizzes ready per category
+TRIVIA_CATEGORIES = ("general", "science", "history", "tech")
+TRIVIA_PREFETCH_SIZE = 2
+TRIVIA_MAX_CONCURRENT_REFILLS = 2  # Bound parallel provider calls during refill
+
+
+def _pick_fact() -> str:
+    """Pick a random fact, using a 3-bit draw when the pool is a power of two"""
+    if len(_FACTS) == 8:
+        return _FACTS[_rng.getrandbits(3)]
+    return _FACTS[_rng.randrange(len(_FACTS))]
+
 
 class FunCommands(commands.Cog):
     """Fun engagement commands"""
@@ -23,6 +97,81 @@ class FunCommands(commands.Cog):
         self.bot = bot
         self.active_riddles = {}  # {user_id: {"question": str, "answer": str, "hints": int}}
         self.active_quizzes = {}  # {user_id: {"questions": list, "current": int, "score": int}}
+        
+        # Prefetched trivia per category: {category: Queue[str]}
+        self._trivia_cache = {
+            cat: asyncio.Queue(maxsize=TRIVIA_PREFETCH_SIZE) for cat in TRIVIA_CATEGORIES
+        }
+        self._trivia_refill_semaphore = asyncio.Semaphore(TRIVIA_MAX_CONCURRENT_REFILLS)
+        self._trivia_refill_task: Optional[asyncio.Task] = None
+    
+    def cog_unload(self):
+        """Stop any in-flight trivia refill when the cog is unloaded"""
+        if self._trivia_refill_task and not self._trivia_refill_task.done():
+            self._trivia_refill_task.cancel()
+    
+    async def _generate_trivia(self, cat: str) -> Optional[str]:
+        """
+        Generate a trivia quiz for a category
+        
+        Args:
+            cat: Trivia category
+            
+        Returns:
+            Quiz text, or None if generation failed
+        """
+        if not self.bot.api_manager:
+            return None
+        
+        prompt = f"Generate 5 trivia questions about {cat}. Format: Question? A) Option1 B) Option2 C) Option3 D) Option4. Answer: X"
+        result = await self.bot.api_manager.generate_response(
+            messages=[{"role": "user", "content": prompt}],
+            system_prompt=_TRIVIA_SYSTEM,
+            query=prompt,
+            detected_language="en",
+            use_cache=False
+        )
+        if result["success"]:
+            return result["response"]
+        return None
+    
+    async def _refill_trivia(self, cat: str):
+        """Top up the prefetch queue for one category"""
+        queue = self._trivia_cache[cat]
+        async with self._trivia_refill_semaphore:
+            while not queue.full():
+                questions_text = await self._generate_trivia(cat)
+                if not questions_text:
+                    return
+                queue.put_nowait(questions_text)
+    
+    async def _refill_trivia_categories(self):
+        """Refill every under-stocked category concurrently"""
+        needs = [cat for cat, queue in self._trivia_cache.items() if queue.qsize() < TRIVIA_PREFETCH_SIZE]
+        if not needs:
+            return
+        results = await asyncio.gather(*(self._refill_trivia(cat) for cat in needs), return_exceptions=True)
+        for cat, result in zip(needs, results):
+            if isinstance(result, Exception):
+                print(f"[ERROR] Trivia prefetch failed for {cat}: {result}")
+    
+    def _schedule_trivia_refill(self):
+        """Start a background refill unless one is already running"""
+        if self._trivia_refill_task is None or self._trivia_refill_task.done():
+            self._trivia_refill_task = asyncio.create_task(self._refill_trivia_categories())
+    
+    async def _send_ai_joke(self, interaction: discord.Interaction, joke_text: str, provider: str):
+        """Send an AI-generated joke as a followup"""
+        if EMBED_HELPER_AVAILABLE:
+            embed = _create_info_embed(
+                title="😄 Joke",
+                description=joke_text,
+                color=_COLOR_KURDISH
+            )
+            embed.set_footer(text=f"⚡ Powered by {provider.capitalize()}")
+            await interaction.followup.send(embed=embed)
+        else:
+            await interaction.followup.send(_JOKE_PREFIX + joke_text)
     
     @app_commands.command(name="joke", description="Get a random AI-generated joke")
     async def joke(self, interaction: discord.Interaction):
@@ -33,47 +182,31 @@ class FunCommands(commands.Cog):
         if self.bot.api_manager:
             try:
                 result = await self.bot.api_manager.generate_response(
-                    messages=[{"role": "user", "content": "Tell me a funny joke. Keep it clean and appropriate for Discord."}],
-                    system_prompt="You are a friendly comedian. Tell clean, family-friendly jokes that are funny and appropriate.",
+                    messages=_JOKE_MESSAGES,
+                    system_prompt=_JOKE_SYSTEM,
                     query="joke",
-                    detected_language="en"
+                    detected_language="en",
+                    use_cache=False
                 )
                 
                 if result["success"]:
-                    joke_text = result["response"]
-                    if EMBED_HELPER_AVAILABLE:
-                        embed = EmbedHelper.create_info_embed(
-                            title="😄 Joke",
-                            description=joke_text,
-                            color=EmbedColors.KURDISH
-                        )
-                        embed.set_footer(text=f"⚡ Powered by {result['provider'].capitalize()}")
-                        await interaction.followup.send(embed=embed)
-                    else:
-                        await interaction.followup.send(f"😄 **Joke**\n\n{joke_text}")
+                    await self._send_ai_joke(interaction, result["response"], result["provider"])
                     return
             except Exception as e:
                 print(f"[ERROR] Joke generation failed: {e}")
         
         # Fallback to static jokes
-        jokes = [
-            "Why don't scientists trust atoms? Because they make up everything!",
-            "Why did the scarecrow win an award? He was outstanding in his field!",
-            "What do you call a fake noodle? An impasta!",
-            "Why don't eggs tell jokes? They'd crack each other up!",
-            "What's the best thing about Switzerland? I don't know, but the flag is a big plus!"
-        ]
-        joke = random.choice(jokes)
+        joke = _rng.choice(_JOKES)
         
         if EMBED_HELPER_AVAILABLE:
-            embed = EmbedHelper.create_info_embed(
+            embed = _create_info_embed(
                 title="😄 Joke",
                 description=joke,
-                color=EmbedColors.KURDISH
+                color=_COLOR_KURDISH
             )
             await interaction.followup.send(embed=embed)
         else:
-            await interaction.followup.send(f"😄 **Joke**\n\n{joke}")
+            await interaction.followup.send(_JOKE_PREFIX + joke)
     
     @app_commands.command(name="story", description="Generate a creative story")
     @app_commands.describe(topic="Topic or theme for the story (optional)")
@@ -89,18 +222,19 @@ class FunCommands(commands.Cog):
             try:
                 result = await self.bot.api_manager.generate_response(
                     messages=[{"role": "user", "content": prompt}],
-                    system_prompt="You are a creative storyteller. Write engaging, imaginative stories that captivate readers.",
+                    system_prompt=_STORY_SYSTEM,
                     query=prompt,
-                    detected_language="en"
+                    detected_language="en",
+                    use_cache=False
                 )
                 
                 if result["success"]:
                     story_text = result["response"]
                     if EMBED_HELPER_AVAILABLE:
-                        embed = EmbedHelper.create_info_embed(
+                        embed = _create_info_embed(
                             title="📖 Story" + (f" - {topic}" if topic else ""),
                             description=story_text[:4096],
-                            color=EmbedColors.PRIMARY
+                            color=_COLOR_PRIMARY
                         )
                         embed.set_footer(text=f"⚡ Powered by {result['provider'].capitalize()}")
                         await interaction.followup.send(embed=embed)
@@ -110,22 +244,14 @@ class FunCommands(commands.Cog):
             except Exception as e:
                 print(f"[ERROR] Story generation failed: {e}")
         
-        await interaction.followup.send("I'm having trouble generating a story right now. Please try again later!")
+        await interaction.followup.send(_STORY_ERROR)
     
     @app_commands.command(name="riddle", description="Get a riddle to solve")
     async def riddle(self, interaction: discord.Interaction):
         """Get a riddle"""
         await interaction.response.defer()
         
-        riddles = [
-            {"q": "I speak without a mouth and hear without ears. I have no body, but I come alive with wind. What am I?", "a": "echo"},
-            {"q": "The more you take, the more you leave behind. What am I?", "a": "footsteps"},
-            {"q": "I have cities, but no houses. I have mountains, but no trees. I have water, but no fish. What am I?", "a": "map"},
-            {"q": "What has keys but no locks, space but no room, and you can enter but not go inside?", "a": "keyboard"},
-            {"q": "I'm tall when I'm young, and short when I'm old. What am I?", "a": "candle"}
-        ]
-        
-        riddle_data = random.choice(riddles)
+        riddle_data = _rng.choice(_RIDDLES)
         user_id = str(interaction.user.id)
         self.active_riddles[user_id] = {
             "question": riddle_data["q"],
@@ -134,10 +260,10 @@ class FunCommands(commands.Cog):
         }
         
         if EMBED_HELPER_AVAILABLE:
-            embed = EmbedHelper.create_info_embed(
+            embed = _create_info_embed(
                 title="🧩 Riddle",
                 description=riddle_data["q"],
-                color=EmbedColors.WARNING
+                color=_COLOR_WARNING
             )
             embed.set_footer(text="Reply with your answer! Use /riddle-hint for a hint.")
             await interaction.followup.send(embed=embed)
@@ -172,51 +298,32 @@ class FunCommands(commands.Cog):
     @app_commands.command(name="fact", description="Get a random interesting fact")
     async def fact(self, interaction: discord.Interaction):
         """Get a random fact"""
-        facts = [
-            "Honey never spoils. Archaeologists have found 3000-year-old honey that's still edible!",
-            "Octopuses have three hearts and blue blood.",
-            "A group of flamingos is called a 'flamboyance'.",
-            "Bananas are berries, but strawberries aren't!",
-            "Sharks have been around longer than trees.",
-            "A day on Venus is longer than its year.",
-            "Wombat poop is cube-shaped!",
-            "There are more possible games of chess than atoms in the observable universe."
-        ]
-        
-        fact = random.choice(facts)
+        fact = _pick_fact()
         
         if EMBED_HELPER_AVAILABLE:
-            embed = EmbedHelper.create_info_embed(
+            embed = _create_info_embed(
                 title="💡 Did You Know?",
                 description=fact,
-                color=EmbedColors.INFO
+                color=_COLOR_INFO
             )
             await interaction.response.send_message(embed=embed)
         else:
-            await interaction.response.send_message(f"💡 **Did You Know?**\n\n{fact}")
+            await interaction.response.send_message(_FACT_PREFIX + fact, ephemeral=False)
     
     @app_commands.command(name="quote", description="Get an inspirational quote")
     async def quote(self, interaction: discord.Interaction):
         """Get an inspirational quote"""
-        quotes = [
-            "The only way to do great work is to love what you do. - Steve Jobs",
-            "Innovation distinguishes between a leader and a follower. - Steve Jobs",
-            "The future belongs to those who believe in the beauty of their dreams. - Eleanor Roosevelt",
-            "It is during our darkest moments that we must focus to see the light. - Aristotle",
-            "Success is not final, failure is not fatal: it is the courage to continue that counts. - Winston Churchill"
-        ]
-        
-        quote = random.choice(quotes)
+        quote = _rng.choice(_QUOTES)
         
         if EMBED_HELPER_AVAILABLE:
-            embed = EmbedHelper.create_info_embed(
+            embed = _create_info_embed(
                 title="💬 Inspirational Quote",
                 description=quote,
-                color=EmbedColors.PRIMARY
+                color=_COLOR_PRIMARY
             )
             await interaction.response.send_message(embed=embed)
         else:
-            await interaction.response.send_message(f"💬 **Quote**\n\n{quote}")
+            await interaction.response.send_message(_QUOTE_PREFIX + quote, ephemeral=False)
     
     @app_commands.command(name="trivia", description="Start a trivia quiz")
     @app_commands.describe(category="Quiz category")
@@ -232,20 +339,17 @@ class FunCommands(commands.Cog):
         
         cat = category.value if category else "general"
         
-        # Generate trivia questions using AI
+        # Serve a prefetched quiz if one is ready, otherwise generate using AI
         if self.bot.api_manager:
             try:
-                prompt = f"Generate 5 trivia questions about {cat}. Format: Question? A) Option1 B) Option2 C) Option3 D) Option4. Answer: X"
-                result = await self.bot.api_manager.generate_response(
-                    messages=[{"role": "user", "content": prompt}],
-                    system_prompt="You are a trivia master. Generate engaging trivia questions with multiple choice answers.",
-                    query=prompt,
-                    detected_language="en"
-                )
+                queue = self._trivia_cache.get(cat)
+                if queue is not None and not queue.empty():
+                    questions_text = queue.get_nowait()
+                else:
+                    questions_text = await self._generate_trivia(cat)
                 
-                if result["success"]:
+                if questions_text:
                     # Parse questions (simplified - in production, better parsing needed)
-                    questions_text = result["response"]
                     user_id = str(interaction.user.id)
                     self.active_quizzes[user_id] = {
                         "questions": [questions_text],
@@ -254,20 +358,21 @@ class FunCommands(commands.Cog):
                     }
                     
                     if EMBED_HELPER_AVAILABLE:
-                        embed = EmbedHelper.create_info_embed(
+                        embed = _create_info_embed(
                             title="🎯 Trivia Quiz",
                             description=f"**Category:** {cat.capitalize()}\n\n{questions_text[:2000]}",
-                            color=EmbedColors.SUCCESS
+                            color=_COLOR_SUCCESS
                         )
                         await interaction.followup.send(embed=embed)
                     else:
                         await interaction.followup.send(f"🎯 **Trivia Quiz - {cat.capitalize()}**\n\n{questions_text[:2000]}")
+                    self._schedule_trivia_refill()
                     return
             except Exception as e:
                 print(f"[ERROR] Trivia generation failed: {e}")
         
         # Fallback
-        await interaction.followup.send("I'm having trouble generating trivia right now. Please try again later!")
+        await interaction.followup.send(_TRIVIA_ERROR)
 
 
 async def setup(bot):
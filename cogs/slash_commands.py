@@ -5,12 +5,18 @@ Slash Commands Cog - Modern Discord slash commands
 import discord
 from discord import app_commands
 from discord.ext import commands
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime
+from collections import OrderedDict
 import asyncio
+import functools
+import io
+import logging
 import random
 import time
 
+log = logging.getLogger(__name__)
+
 # Import responses for fallback
 try:
     from responses import find_response
@@ -33,6 +39,82 @@ try:
 except ImportError:
     EMBED_HELPER_AVAILABLE = False
 
+# Inputs shorter than this are too short to classify reliably
+MIN_DETECTION_LENGTH = 4
+# Arabic-script block plus Kurmanji Latin letters; text with none of these is
+# treated as English without running the detector
+KURDISH_CHARSET = frozenset(map(chr, range(0x0600, 0x0700))) | frozenset("çÇşŞêÊîÎûÛ")
+# Longer inputs are truncated before detection to bound the cache's memory
+DETECTION_CACHE_KEY_LENGTH = 256
+
+# Discord's maximum embed description length
+EMBED_DESCRIPTION_LIMIT = 4096
+
+# discord.Color.green() as a raw int, for dict-built embeds
+STATS_EMBED_COLOR = 0x2ECC71
+
+# Values offered by /personality
+PERSONALITY_CHOICES = ("friendly", "professional", "funny", "helpful")
+
+# Upper bound on users tracked by the /ask rate limiter
+RATE_LIMIT_MAX_TRACKED_USERS = 10_000
+
+# (minimum seconds, span in seconds) for the optional human-like reply delay
+HUMAN_DELAY_RANGE = (0.5, 1.0)
+
+# /export JSON, TXT and PDF files are built in memory, so they hold at most
+# this many of the newest conversations; CSV streams every conversation
+EXPORT_DOCUMENT_LIMIT = 5000
+
+
+def _detect_language(text: str) -> Tuple[str, Optional[str], float]:
+    """
+    Detect language and Kurdish dialect, memoized on the normalized text
+    
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        Tuple of (language_code, kurdish_dialect, confidence); dialect is None
+        unless the text is Kurdish
+    """
+    return _detect_language_cached(text.strip().lower()[:DETECTION_CACHE_KEY_LENGTH])
+
+
+@functools.lru_cache(maxsize=4096)
+def _detect_language_cached(text: str) -> Tuple[str, Optional[str], float]:
+    """Detection body behind the LRU cache; expects normalized text"""
+    language, confidence = KurdishDetector.detect_language(text)
+    
+    # If Kurdish detected, determine dialect
+    if language == 'ku':
+        kurdish_result = KurdishDetector.detect_kurdish(text)
+        if kurdish_result:
+            dialect, confidence = kurdish_result
+            return language, dialect, confidence
+    
+    return language, None, confidence
+
+
+def _split_content(text: str, max_length: int) -> Tuple[str, ...]:
+    """Split text into embed-sized chunks, memoizing the work for long texts"""
+    if len(text) <= max_length:
+        return (text,)
+    return _split_long_content_cached(text, max_length)
+
+
+@functools.lru_cache(maxsize=512)
+def _split_long_content_cached(text: str, max_length: int) -> Tuple[str, ...]:
+    """Memoized EmbedHelper.split_long_content; tuples so cached results stay immutable"""
+    return tuple(EmbedHelper.split_long_content(text, max_length=max_length))
+
+
+def _format_uptime(total_seconds: int) -> str:
+    """Format a duration in seconds as H:MM:SS"""
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
 
 class SlashCommands(commands.Cog):
     """Handles Discord slash commands"""
@@ -45,10 +127,37 @@ class SlashCommands(commands.Cog):
             bot: Discord bot instance
         """
         self.bot = bot
+        
+        # /help content is static per process, so serialize it once
+        self._help_embed_dict = None
+        self.rebuild_help_embed()
+        
+        # Static success embeds, serialized once
+        self._cleared_embed_dict = discord.Embed(
+            title="✅ Cleared",
+            description="Conversation history cleared for this channel!",
+            color=discord.Color.green()
+        ).to_dict()
+        self._personality_embed_dicts = {
+            value: discord.Embed(
+                title="✅ Personality Changed",
+                description=f"Personality changed to **{value.capitalize()}**!\nI'll use this tone in our conversations.",
+                color=discord.Color.purple()
+            ).to_dict()
+            for value in PERSONALITY_CHOICES
+        }
+        
+        # Bot start as an epoch timestamp, so /stats uptime is plain float math
+        self._start_time_ts = self.bot.start_time.timestamp()
+        
+        # /ask rate limiting: {user_id: (tokens, last_refill_monotonic)}
+        self._rate_buckets: OrderedDict = OrderedDict()
+        
+        # Strong references to fire-and-forget tasks so they aren't garbage collected
+        self._background_tasks = set()
     
-    @app_commands.command(name="help", description="Show bot help and available commands")
-    async def help_slash(self, interaction: discord.Interaction):
-        """Show all available commands"""
+    def rebuild_help_embed(self):
+        """Build the /help embed once; call again if the prefix changes"""
         prefix = self.bot.config.get("prefix", "!")
         
         embed = discord.Embed(
@@ -93,12 +202,19 @@ class SlashCommands(commands.Cog):
         )
         
         embed.set_footer(text="Made with ❤️ for Discord")
+        self._help_embed_dict = embed.to_dict()
+    
+    @app_commands.command(name="help", description="Show bot help and available commands")
+    async def help_slash(self, interaction: discord.Interaction):
+        """Show all available commands"""
+        embed = discord.Embed.from_dict(self._help_embed_dict)
         await interaction.response.send_message(embed=embed)
     
     @app_commands.command(name="ask", description="Ask the bot anything")
     @app_commands.describe(question="Your question or message to the bot (optional)")
     async def ask_slash(self, interaction: discord.Interaction, question: Optional[str] = None):
         """Ask the bot a question"""
+        # Defer first so the 3-second interaction window is never at risk
         await interaction.response.defer()
         
         # If no question provided, prompt user
@@ -109,83 +225,77 @@ class SlashCommands(commands.Cog):
             )
             return
         
-        # Show typing indicator while processing
-        # Note: Discord automatically shows typing for deferred interactions, but we can keep it active
-        async with interaction.channel.typing():
-            # Start timing the response
-            start_time = None
-            if self.bot.response_tracker:
-                start_time = self.bot.response_tracker.start_timer()
-            
-            # Check rate limit using bot's method
-            if hasattr(self.bot, '_check_rate_limit'):
-                if not self.bot._check_rate_limit(interaction.user.id):
-                    await interaction.followup.send("Whoa, slow down! Let's chat in a minute 😊")
-                    return
+        # No typing() context here: Discord already shows "thinking..." for
+        # deferred interactions, so it would only cost an extra REST call
+        
+        # Start timing the response
+        start_time = None
+        if self.bot.response_tracker:
+            start_time = self.bot.response_tracker.start_timer()
+        
+        # Check rate limit (per-user token bucket)
+        if not self._consume_rate_token(interaction.user.id, interaction.guild):
+            await interaction.followup.send("Whoa, slow down! Let's chat in a minute 😊")
+            return
         
         try:
-            # Detect language (especially Kurdish)
+            # Detect language (especially Kurdish) in a worker thread so the
+            # regex scans don't block the event loop
             detected_language = 'en'
             kurdish_dialect = None
-            if KURDISH_DETECTOR_AVAILABLE:
-                lang_result = KurdishDetector.detect_language(question)
-                detected_language = lang_result[0]
-                
-                # If Kurdish detected, determine dialect
-                if detected_language == 'ku':
-                    kurdish_result = KurdishDetector.detect_kurdish(question)
-                    if kurdish_result:
-                        kurdish_dialect, confidence = kurdish_result
-                        print(f"[INFO] Kurdish detected in slash command: {kurdish_dialect} (confidence: {confidence:.2f})")
+            if (
+                KURDISH_DETECTOR_AVAILABLE
+                and len(question.strip()) >= MIN_DETECTION_LENGTH
+                and not KURDISH_CHARSET.isdisjoint(question)
+            ):
+                detected_language, kurdish_dialect, confidence = await asyncio.to_thread(
+                    _detect_language, question
+                )
+                if kurdish_dialect:
+                    log.info("Kurdish detected in slash command: %s (confidence: %.2f)", kurdish_dialect, confidence)
             
             # Use bot's message handling logic
             # Create a mock message-like object for processing
             user_id = str(interaction.user.id)
             channel_id = str(interaction.channel.id)
             
-            # Store user message in database if memory manager is available
-            if self.bot.memory_manager:
-                self.bot.memory_manager.add_message(
-                    user_id=user_id,
-                    channel_id=channel_id,
-                    role="user",
-                    content=question
-                )
+            # Bind handlers once instead of re-resolving them through self.bot
+            claude = self.bot.claude_handler if self.bot.use_claude else None
+            mm = self.bot.memory_manager
+            
+            # The user message is stored together with the reply below; the
+            # context lookup appends it in memory until then
+            pending_writes = [("user", question)]
             
-            # Get conversation context
+            # Get conversation context and user facts for personalization.
+            # MemoryManager opens a connection per call, so both reads can
+            # run concurrently in worker threads
             api_messages = []
             summary_texts = []
-            if self.bot.memory_manager:
-                api_messages, summary_texts = self.bot.memory_manager.get_conversation_context(
-                    user_id=user_id,
-                    channel_id=channel_id,
-                    include_summaries=True
+            user_facts = []
+            if mm:
+                (api_messages, summary_texts), user_facts = await asyncio.gather(
+                    asyncio.to_thread(
+                        mm.get_conversation_context,
+                        user_id=user_id,
+                        channel_id=channel_id,
+                        include_summaries=True
+                    ),
+                    asyncio.to_thread(mm.get_all_user_facts, user_id, channel_id)
                 )
                 if not api_messages or api_messages[-1]["content"] != question:
                     api_messages.append({"role": "user", "content": question})
             else:
                 api_messages = [{"role": "user", "content": question}]
             
-            # Get user facts for personalization
-            user_facts = []
-            if self.bot.memory_manager:
-                facts_list = self.bot.memory_manager.get_all_user_facts(user_id, channel_id)
-                user_facts = facts_list
-            
-            # Get user facts for personalization
-            user_facts = []
-            if self.bot.memory_manager:
-                facts_list = self.bot.memory_manager.get_all_user_facts(user_id, channel_id)
-                user_facts = facts_list
-            
             # Generate response using Claude or fallback
             response_text = None
             tokens_used = 0
             model_used = "static_fallback"
             result = None
             
-            if self.bot.use_claude and self.bot.claude_handler:
-                result = await self.bot.claude_handler.generate_response(
+            if claude is not None:
+                result = await claude.generate_response(
                     messages=api_messages,
                     user_name=interaction.user.display_name,
                     summaries=summary_texts if summary_texts else None,
@@ -197,12 +307,12 @@ class SlashCommands(commands.Cog):
                 if result["success"]:
                     response_text = result["response"]
                     tokens_used = result.get("tokens_used", 0)
-                    model_used = self.bot.claude_handler.model
+                    model_used = claude.model
                     self.bot.claude_responses += 1
                 else:
                     # Claude API failed - use fallback with helpful message
                     error_msg = result.get("error", "Unknown error")
-                    print(f"[WARNING] Claude API failed: {error_msg}")
+                    log.warning("Claude API failed: %s", error_msg)
                     fallback_response = find_response(question, detected_language, kurdish_dialect)
                     
                     # Add helpful note about API issue
@@ -227,89 +337,35 @@ class SlashCommands(commands.Cog):
                 )
                 self.bot.fallback_responses += 1
             
-            # Store bot response
-            if self.bot.memory_manager:
-                self.bot.memory_manager.add_message(
-                    user_id=user_id,
-                    channel_id=channel_id,
-                    role="assistant",
-                    content=response_text
-                )
-            
-            # Log conversation
-            if self.bot.conversation_logger:
-                # Determine tokens and model used
-                tokens_used_log = 0
-                model_used_log = "static_fallback"
-                if self.bot.use_claude and self.bot.claude_handler:
-                    if result and result.get("success"):
-                        tokens_used_log = result.get("tokens_used", 0)
-                        model_used_log = self.bot.claude_handler.model
-                
-                self.bot.conversation_logger.log_conversation(
-                    user_id=user_id,
-                    user_name=interaction.user.display_name,
-                    channel_id=channel_id,
-                    user_message=question,
-                    bot_response=response_text,
-                    tokens_used=tokens_used_log,
-                    model_used=model_used_log
-                )
-            
             # Calculate response time and format it
             response_time = None
             response_time_text = None
             if start_time and self.bot.response_tracker:
                 response_time = time.time() - start_time
                 response_time_text = f"⏱️ Responded in {self.bot.response_tracker.format_response_time(response_time)}"
-                
-                # Record response time
-                self.bot.response_tracker.record_response_time(
-                    response_time=response_time,
-                    user_id=user_id,
-                    channel_id=channel_id,
-                    used_claude=(self.bot.use_claude and result and result.get("success")),
-                    model_used=model_used_log,
-                    tokens_used=tokens_used_log
-                )
             
-            # Add human-like delay for very short responses (< 50 chars)
-            # This makes the bot feel more natural
-            if len(response_text) < 50 and response_time and response_time < 0.5:
+            # Optional human-like delay for very short responses (< 50 chars).
+            # Off by default since it is pure dead time before the reply
+            if (
+                self.bot.config.get("human_like_delay", False)
+                and len(response_text) < 50 and response_time and response_time < 0.5
+            ):
                 # Add random delay between 0.5-1.5 seconds for short responses
-                delay = random.uniform(0.5, 1.5)
-                await asyncio.sleep(delay)
+                delay_min, delay_span = HUMAN_DELAY_RANGE
+                await asyncio.sleep(delay_min + random.random() * delay_span)
                 # Update response time to include delay
                 if start_time and self.bot.response_tracker:
                     response_time = time.time() - start_time
                     response_time_text = f"⏱️ Responded in {self.bot.response_tracker.format_response_time(response_time)}"
             
-            # Generate question suggestions (only for successful Claude responses)
-            question_suggestions = []
-            if self.bot.use_claude and self.bot.claude_handler and result and result.get("success"):
-                try:
-                    # Get recent conversation history for context
-                    recent_history = api_messages[-10:] if api_messages else []
-                    
-                    question_suggestions = await self.bot.claude_handler.generate_question_suggestions(
-                        user_question=question,
-                        bot_answer=response_text,
-                        conversation_history=recent_history,
-                        user_facts=user_facts,
-                        detected_language=detected_language,
-                        kurdish_dialect=kurdish_dialect
-                    )
-                except Exception as e:
-                    print(f"[ERROR] Failed to generate question suggestions: {e}")
-                    question_suggestions = []
-            
             # Update statistics
             self.bot.message_count += 1
+            answer_text = response_text
             
             # Create embed for AI response
             if EMBED_HELPER_AVAILABLE:
                 # Split long content if needed
-                content_chunks = EmbedHelper.split_long_content(response_text, max_length=4096)
+                content_chunks = _split_content(response_text, EMBED_DESCRIPTION_LIMIT)
                 
                 # Create main embed
                 embed = EmbedHelper.create_ai_response_embed(
@@ -327,16 +383,7 @@ class SlashCommands(commands.Cog):
                         inline=False
                     )
                 
-                # Add question suggestions if available
-                if question_suggestions:
-                    suggestions_text = "\n".join([f"❓ {q}" for q in question_suggestions])
-                    embed.add_field(
-                        name="💡 You might also want to know:",
-                        value=suggestions_text[:1024],
-                        inline=False
-                    )
-                
-                await interaction.followup.send(embed=embed)
+                send_task = asyncio.create_task(interaction.followup.send(embed=embed))
             else:
                 # Fallback: append response time to text
                 if response_time_text:
@@ -345,18 +392,69 @@ class SlashCommands(commands.Cog):
                         response_text = response_text[:max_length] + "..."
                     response_text += f"\n\n{response_time_text}"
                 
-                # Add suggestions to text response
-                if question_suggestions:
-                    response_text += "\n\n💡 **You might also want to know:**\n"
-                    for q in question_suggestions:
-                        response_text += f"❓ {q}\n"
-                
-                await interaction.followup.send(response_text)
+                embed = None
+                send_task = asyncio.create_task(interaction.followup.send(response_text))
+            
+            # Persistence does not shape the reply: start the send first, then
+            # let the writes run in worker threads while Discord acknowledges it
+            if mm:
+                pending_writes.append(("assistant", answer_text))
+                self._spawn(self._run_in_background(
+                    "memory write",
+                    mm.add_messages,
+                    user_id, channel_id, pending_writes
+                ))
+            
+            # Log conversation
+            if self.bot.conversation_logger:
+                self._spawn(self._run_in_background(
+                    "conversation log",
+                    self.bot.conversation_logger.log_conversation,
+                    user_id=user_id,
+                    user_name=interaction.user.display_name,
+                    channel_id=channel_id,
+                    user_message=question,
+                    bot_response=answer_text,
+                    tokens_used=tokens_used,
+                    model_used=model_used
+                ))
+            
+            # Record response time
+            if response_time is not None:
+                self._spawn(self._run_in_background(
+                    "response time record",
+                    self.bot.response_tracker.record_response_time,
+                    response_time=response_time,
+                    user_id=user_id,
+                    channel_id=channel_id,
+                    used_claude=bool(result and result.get("success")),
+                    model_used=model_used,
+                    tokens_used=tokens_used
+                ))
+            
+            # Wait for the send so failures still reach the error handler below
+            message = await send_task
+            
+            # Question suggestions are a second Claude round-trip, so they are
+            # opt-in and appended after the answer is already visible
+            if (
+                self.bot.config.get("generate_suggestions", False)
+                and claude is not None and result and result.get("success")
+            ):
+                self._spawn(self._append_question_suggestions(
+                    message=message,
+                    embed=embed,
+                    answer_text=answer_text,
+                    message_text=response_text,
+                    question=question,
+                    recent_history=api_messages[-10:],
+                    user_facts=user_facts,
+                    detected_language=detected_language,
+                    kurdish_dialect=kurdish_dialect
+                ))
         except Exception as e:
             error_msg = str(e)
-            print(f"[ERROR] Ask slash command error: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Ask slash command error")
             
             # Provide helpful error message
             if "CLAUDE_API_KEY" in error_msg or "api key" in error_msg.lower():
@@ -371,6 +469,98 @@ class SlashCommands(commands.Cog):
                     "Please try again in a moment, or use `!help` to see available commands."
                 )
     
+    def _rate_limit_for(self, user_id: int, guild: Optional[discord.Guild]) -> int:
+        """Messages per minute allowed for a user, honoring the bot's permission levels"""
+        if hasattr(self.bot, '_get_rate_limit_for_level'):
+            level = self.bot._get_user_permission_level(user_id, guild)
+            return self.bot._get_rate_limit_for_level(level)
+        return self.bot.config.get("rate_limit_per_minute", 5)
+    
+    def _consume_rate_token(self, user_id: int, guild: Optional[discord.Guild] = None) -> bool:
+        """
+        Take one token from the user's bucket
+        
+        Each bucket holds up to a minute's allowance and refills continuously.
+        Buckets live in an LRU-ordered map capped at RATE_LIMIT_MAX_TRACKED_USERS,
+        so memory stays bounded no matter how many users show up.
+        
+        Args:
+            user_id: Discord user ID
+            guild: Guild the command was used in (for admin detection)
+            
+        Returns:
+            True if within limit, False if rate limited
+        """
+        capacity = self._rate_limit_for(user_id, guild)
+        now = time.monotonic()
+        tokens, last = self._rate_buckets.pop(user_id, (capacity, now))
+        tokens = min(capacity, tokens + (now - last) * capacity / 60.0)
+        
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        
+        # Re-inserting moves the user to the most-recently-used end
+        self._rate_buckets[user_id] = (tokens, now)
+        if len(self._rate_buckets) > RATE_LIMIT_MAX_TRACKED_USERS:
+            self._rate_buckets.popitem(last=False)
+        
+        return allowed
+    
+    def _spawn(self, coro):
+        """Run a coroutine in the background, keeping a reference until it finishes"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        return task
+    
+    async def _run_in_background(self, description: str, func, *args, **kwargs):
+        """Run a blocking call in a worker thread, logging instead of raising on failure"""
+        try:
+            await asyncio.to_thread(func, *args, **kwargs)
+        except Exception:
+            log.exception("Background %s failed", description)
+    
+    async def _append_question_suggestions(
+        self,
+        message: discord.WebhookMessage,
+        embed: Optional[discord.Embed],
+        answer_text: str,
+        message_text: str,
+        question: str,
+        recent_history: list,
+        user_facts: list,
+        detected_language: str,
+        kurdish_dialect: Optional[str]
+    ):
+        """Generate follow-up question suggestions and edit them into a sent answer"""
+        try:
+            question_suggestions = await self.bot.claude_handler.generate_question_suggestions(
+                user_question=question,
+                bot_answer=answer_text,
+                conversation_history=recent_history,
+                user_facts=user_facts,
+                detected_language=detected_language,
+                kurdish_dialect=kurdish_dialect
+            )
+            if not question_suggestions:
+                return
+            
+            if embed is not None:
+                suggestions_text = "\n".join(f"❓ {q}" for q in question_suggestions)
+                embed.add_field(
+                    name="💡 You might also want to know:",
+                    value=suggestions_text[:1024],
+                    inline=False
+                )
+                await message.edit(embed=embed)
+            else:
+                message_text += "\n\n💡 **You might also want to know:**\n"
+                message_text += "".join(f"❓ {q}\n" for q in question_suggestions)
+                await message.edit(content=message_text[:2000])
+        except Exception as e:
+            log.error("Failed to generate question suggestions: %s", e)
+    
     @app_commands.command(name="stats", description="Show bot statistics")
     async def stats_slash(self, interaction: discord.Interaction):
         """Show conversation statistics"""
@@ -379,36 +569,7 @@ class SlashCommands(commands.Cog):
             return
         
         try:
-            stats = self.bot.conversation_logger.get_stats()
-            
-            embed = discord.Embed(
-                title="📊 Conversation Statistics",
-                color=discord.Color.green()
-            )
-            
-            embed.add_field(
-                name="📝 Total Conversations",
-                value=f"{stats['total_conversations']:,}",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="👥 Total Users",
-                value=f"{stats['total_users']:,}",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="💬 Recent (24h)",
-                value=f"{stats['recent_24h']:,}",
-                inline=True
-            )
-            
-            embed.add_field(
-                name="🔢 Total Tokens Used",
-                value=f"{stats['total_tokens']:,}",
-                inline=False
-            )
+            stats = await asyncio.to_thread(self.bot.conversation_logger.get_stats)
             
             # Models used
             if stats['models_used']:
@@ -419,38 +580,29 @@ class SlashCommands(commands.Cog):
             else:
                 models_text = "No data yet"
             
-            embed.add_field(
-                name="🤖 Models Used",
-                value=models_text,
-                inline=False
-            )
-            
             # Add bot stats
-            uptime = datetime.now() - self.bot.start_time
-            uptime_str = str(uptime).split('.')[0]
-            embed.add_field(
-                name="⏱️ Bot Uptime",
-                value=uptime_str,
-                inline=True
-            )
-            embed.add_field(
-                name="💬 Messages Processed",
-                value=f"{self.bot.message_count:,}",
-                inline=True
-            )
-            embed.add_field(
-                name="🏓 Latency",
-                value=f"{round(self.bot.latency * 1000)}ms",
-                inline=True
-            )
-            
-            embed.set_footer(text="Data collected for training purposes")
+            uptime_str = _format_uptime(int(time.time() - self._start_time_ts))
+            
+            # Build the payload in one go rather than mutating via add_field
+            embed = discord.Embed.from_dict({
+                "title": "📊 Conversation Statistics",
+                "color": STATS_EMBED_COLOR,
+                "fields": [
+                    {"name": "📝 Total Conversations", "value": f"{stats['total_conversations']:,}", "inline": True},
+                    {"name": "👥 Total Users", "value": f"{stats['total_users']:,}", "inline": True},
+                    {"name": "💬 Recent (24h)", "value": f"{stats['recent_24h']:,}", "inline": True},
+                    {"name": "🔢 Total Tokens Used", "value": f"{stats['total_tokens']:,}", "inline": False},
+                    {"name": "🤖 Models Used", "value": models_text, "inline": False},
+                    {"name": "⏱️ Bot Uptime", "value": uptime_str, "inline": True},
+                    {"name": "💬 Messages Processed", "value": f"{self.bot.message_count:,}", "inline": True},
+                    {"name": "🏓 Latency", "value": f"{round(self.bot.latency * 1000)}ms", "inline": True}
+                ],
+                "footer": {"text": "Data collected for training purposes"}
+            })
             await interaction.response.send_message(embed=embed)
         except Exception as e:
             await interaction.response.send_message(f"❌ Error getting statistics: {str(e)}", ephemeral=True)
-            print(f"[ERROR] Stats slash command failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Stats slash command failed")
     
     @app_commands.command(name="clear", description="Clear conversation history for this channel")
     async def clear_slash(self, interaction: discord.Interaction):
@@ -475,15 +627,11 @@ class SlashCommands(commands.Cog):
                 if conversation_cog.context_manager:
                     conversation_cog.context_manager.clear_context(channel_id)
             
-            embed = discord.Embed(
-                title="✅ Cleared",
-                description="Conversation history cleared for this channel!",
-                color=discord.Color.green()
-            )
+            embed = discord.Embed.from_dict(self._cleared_embed_dict)
             await interaction.response.send_message(embed=embed, ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"❌ Error clearing history: {str(e)}", ephemeral=True)
-            print(f"[ERROR] Clear slash command failed: {e}")
+            log.error("Clear slash command failed: %s", e)
     
     @app_commands.command(name="personality", description="Change bot personality")
     @app_commands.describe(personality="Personality type to use")
@@ -511,15 +659,11 @@ class SlashCommands(commands.Cog):
                 )
                 conversation_cog.context_manager.save_preferences()
             
-            embed = discord.Embed(
-                title="✅ Personality Changed",
-                description=f"Personality changed to **{personality.value.capitalize()}**!\nI'll use this tone in our conversations.",
-                color=discord.Color.purple()
-            )
+            embed = discord.Embed.from_dict(self._personality_embed_dicts[personality.value])
             await interaction.response.send_message(embed=embed, ephemeral=True)
         except Exception as e:
             await interaction.response.send_message(f"❌ Error changing personality: {str(e)}", ephemeral=True)
-            print(f"[ERROR] Personality slash command failed: {e}")
+            log.error("Personality slash command failed: %s", e)
     
     @app_commands.command(name="export", description="Export conversation data")
     @app_commands.describe(format="Export format")
@@ -556,33 +700,48 @@ class SlashCommands(commands.Cog):
         try:
             await interaction.response.defer(ephemeral=True)
             
-            # Get all conversations
-            conversations = self.bot.conversation_logger.get_all_conversations()
+            conv_logger = self.bot.conversation_logger
             
-            if not conversations:
+            # One row off the timestamp index tells whether there is anything
+            if not await asyncio.to_thread(conv_logger.get_all_conversations, 1):
                 await interaction.followup.send(
                     "📭 No conversations found to export!",
                     ephemeral=True
                 )
                 return
             
-            # Export using export manager
-            filepath = self.bot.export_manager.export_conversations(
-                conversations=conversations,
-                format=export_format
-            )
-            
-            if not filepath:
-                await interaction.followup.send(
-                    f"❌ Failed to export to {export_format.upper()}. PDF export requires reportlab library.",
-                    ephemeral=True
+            if export_format == "csv":
+                # Stream every conversation into an in-memory CSV (COPY on
+                # PostgreSQL) instead of building a dict per row first
+                filename = f"conversation_export_{datetime.now():%Y%m%d_%H%M%S}.csv"
+                export_file = io.BytesIO()
+                await asyncio.to_thread(conv_logger.export_to_csv, output_path=filename, file_obj=export_file)
+                export_file.seek(0)
+                exported = "All"
+            else:
+                # Document formats are built in memory, so they are bounded
+                conversations = await asyncio.to_thread(conv_logger.get_all_conversations, EXPORT_DOCUMENT_LIMIT)
+                filepath = self.bot.export_manager.export_conversations(
+                    conversations=conversations,
+                    format=export_format
                 )
-                return
+                
+                if not filepath:
+                    await interaction.followup.send(
+                        f"❌ Failed to export to {export_format.upper()}. PDF export requires reportlab library.",
+                        ephemeral=True
+                    )
+                    return
+                
+                filename = filepath.split('/')[-1] if '/' in filepath else filepath.split('\\')[-1]
+                export_file = open(filepath, 'rb')
+                exported = str(len(conversations))
+                if len(conversations) == EXPORT_DOCUMENT_LIMIT:
+                    exported = f"Newest {exported} (use CSV for all)"
             
             # Send file to Discord
-            filename = filepath.split('/')[-1] if '/' in filepath else filepath.split('\\')[-1]
-            with open(filepath, 'rb') as f:
-                file = discord.File(f, filename=filename)
+            with export_file:
+                file = discord.File(export_file, filename=filename)
                 
                 if EMBED_HELPER_AVAILABLE:
                     embed = EmbedHelper.create_success_embed(
@@ -590,7 +749,7 @@ class SlashCommands(commands.Cog):
                         description=(
                             f"📁 **File**: `{filename}`\n"
                             f"📊 **Format**: {export_format.upper()}\n"
-                            f"📝 **Conversations**: {len(conversations)}"
+                            f"📝 **Conversations**: {exported}"
                         )
                     )
                     await interaction.followup.send(embed=embed, file=file, ephemeral=True)
@@ -599,26 +758,25 @@ class SlashCommands(commands.Cog):
                         f"✅ **Export Complete!**\n"
                         f"📁 File: `{filename}`\n"
                         f"📊 Format: {export_format.upper()}\n"
-                        f"📝 Conversations: {len(conversations)}",
+                        f"📝 Conversations: {exported}",
                         file=file,
                         ephemeral=True
                     )
             
-            print(f"[OK] Exported {len(conversations)} conversations to {filepath}")
+            log.info("Exported %s conversations as %s", exported, filename)
         except Exception as e:
             await interaction.followup.send(
                 f"❌ Error exporting conversations: {str(e)}",
                 ephemeral=True
             )
-            print(f"[ERROR] Export slash command failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Export slash command failed")
     
     @app_commands.command(name="summarize", description="Summarize conversation history")
     @app_commands.describe(user="Optional user to summarize (mention)")
     async def summarize_slash(self, interaction: discord.Interaction, user: Optional[discord.Member] = None):
         """Summarize conversation history"""
-        if not self.bot.memory_manager:
+        mm = self.bot.memory_manager
+        if not mm:
             await interaction.response.send_message(
                 "❌ Memory manager not available!",
                 ephemeral=True
@@ -641,29 +799,23 @@ class SlashCommands(commands.Cog):
         await interaction.response.defer(ephemeral=False)
         
         try:
-            # Get recent messages (last 20)
-            recent_messages = self.bot.memory_manager.get_recent_messages(
+            # Get recent messages (last 20), already in API format
+            api_messages, time_range = mm.get_recent_messages_api_format(
                 user_id=target_user_id,
                 channel_id=channel_id,
                 limit=20
             )
             
-            if len(recent_messages) < 2:
+            if len(api_messages) < 2:
                 await interaction.followup.send(
-                    f"📭 Not enough messages to summarize. Found {len(recent_messages)} message(s).",
+                    f"📭 Not enough messages to summarize. Found {len(api_messages)} message(s).",
                     ephemeral=True
                 )
                 return
             
-            # Convert to API format
-            api_messages = [
-                {"role": msg["role"], "content": msg["content"]}
-                for msg in recent_messages
-            ]
-            
             # Get timestamps
-            start_time = datetime.fromisoformat(recent_messages[0]["timestamp"])
-            end_time = datetime.fromisoformat(recent_messages[-1]["timestamp"])
+            start_time = datetime.fromisoformat(time_range[0])
+            end_time = datetime.fromisoformat(time_range[1])
             
             # Create summary with details extraction
             summary_result = await self.bot.summarizer.summarize_messages(
@@ -679,42 +831,36 @@ class SlashCommands(commands.Cog):
             
             # Create summary embed
             if EMBED_HELPER_AVAILABLE:
-                embed = discord.Embed(
-                    title=f"📝 Conversation Summary - {target_user_name}",
-                    description=summary_text[:2000],
-                    color=EmbedColors.BLUE
-                )
+                fields = []
                 
                 # Add key topics
                 if key_topics:
-                    topics_text = "\n".join([f"• {topic}" for topic in key_topics[:5]])
-                    embed.add_field(
-                        name="🔑 Key Topics",
-                        value=topics_text[:1024],
-                        inline=False
-                    )
+                    topics_text = "\n".join(f"• {topic}" for topic in key_topics[:5])
+                    fields.append({"name": "🔑 Key Topics", "value": topics_text[:1024], "inline": False})
                 
                 # Add important information
                 if important_info:
-                    info_text = "\n".join([f"• {info}" for info in important_info[:5]])
-                    embed.add_field(
-                        name="💡 Important Information",
-                        value=info_text[:1024],
-                        inline=False
-                    )
+                    info_text = "\n".join(f"• {info}" for info in important_info[:5])
+                    fields.append({"name": "💡 Important Information", "value": info_text[:1024], "inline": False})
                 
                 # Add statistics
-                embed.add_field(
-                    name="📊 Statistics",
-                    value=(
-                        f"**Messages Analyzed**: {len(recent_messages)}\n"
+                fields.append({
+                    "name": "📊 Statistics",
+                    "value": (
+                        f"**Messages Analyzed**: {len(api_messages)}\n"
                         f"**Time Range**: {start_time.strftime('%Y-%m-%d %H:%M')} - {end_time.strftime('%H:%M')}\n"
                         f"**User**: {target_user_name}"
                     ),
-                    inline=False
-                )
+                    "inline": False
+                })
                 
-                embed.set_footer(text="Summary saved to database")
+                embed = discord.Embed.from_dict({
+                    "title": f"📝 Conversation Summary - {target_user_name}",
+                    "description": summary_text[:2000],
+                    "color": EmbedColors.BLUE,
+                    "fields": fields,
+                    "footer": {"text": "Summary saved to database"}
+                })
                 
                 await interaction.followup.send(embed=embed)
             else:
@@ -724,41 +870,37 @@ class SlashCommands(commands.Cog):
                 
                 if key_topics:
                     result_text += "**🔑 Key Topics:**\n"
-                    for topic in key_topics[:5]:
-                        result_text += f"• {topic}\n"
+                    result_text += "".join(f"• {topic}\n" for topic in key_topics[:5])
                     result_text += "\n"
                 
                 if important_info:
                     result_text += "**💡 Important Information:**\n"
-                    for info in important_info[:5]:
-                        result_text += f"• {info}\n"
+                    result_text += "".join(f"• {info}\n" for info in important_info[:5])
                 
-                result_text += f"\n**📊 Statistics:** {len(recent_messages)} messages analyzed"
+                result_text += f"\n**📊 Statistics:** {len(api_messages)} messages analyzed"
                 await interaction.followup.send(result_text)
             
             # Save summary to database
             try:
-                summary_id = self.bot.memory_manager.create_summary(
+                summary_id = mm.create_summary(
                     user_id=target_user_id,
                     channel_id=channel_id,
                     summary_text=summary_text,
-                    message_count=len(recent_messages),
+                    message_count=len(api_messages),
                     start_timestamp=start_time,
                     end_timestamp=end_time,
                     importance_score=0.7
                 )
-                print(f"[OK] Summary created via slash command: ID={summary_id}")
+                log.info("Summary created via slash command: ID=%s", summary_id)
             except Exception as e:
-                print(f"[ERROR] Failed to save summary: {e}")
+                log.error("Failed to save summary: %s", e)
         
         except Exception as e:
             await interaction.followup.send(
                 f"❌ Error creating summary: {str(e)}",
                 ephemeral=True
             )
-            print(f"[ERROR] Summarize slash command failed: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Summarize slash command failed")
 
 
 async def setup(bot):
@@ -4,11 +4,34 @@ Voice Channel Support - Text-to-speech for voice channels
 
 import discord
 from discord.ext import commands
-import pyttsx3
 import io
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import os
+import queue
+import tempfile
+
+
+class _ChunkPipe:
+    """Blocking file-like reader over a queue of audio chunks, ended by None"""
+    
+    def __init__(self, chunks: queue.Queue):
+        self._chunks = chunks
+        self._done = False
+        # Set once any audio has been read, i.e. something was played
+        self.received = False
+    
+    def read(self, size: int = -1) -> bytes:
+        """Return the next chunk, or b"" once the stream has ended"""
+        if self._done:
+            return b""
+        data = self._chunks.get()
+        if data is None:
+            self._done = True
+            return b""
+        self.received = True
+        return data
 
 
 class VoiceSupport(commands.Cog):
@@ -24,14 +47,170 @@ class VoiceSupport(commands.Cog):
         self.bot = bot
         self.voice_clients = {}
         self.tts_engine = None
+        self.tts_voice = self.bot.config.get("tts_voice", "en-US-AriaNeural")
+        
+        # edge-tts streams audio as it is synthesized, so playback can start
+        # on the first chunk. pyttsx3 is the offline fallback: set up here
+        # when edge-tts isn't installed, otherwise on the first edge-tts
+        # failure (e.g. no network)
+        try:
+            import edge_tts
+            self._edge_tts = edge_tts
+        except ImportError:
+            self._edge_tts = None
+        
+        # pyttsx3 blocks and is not thread-safe, so every engine call runs on
+        # this single worker thread instead of the event loop
+        self._tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tts")
         
         # Initialize TTS engine
+        if self._edge_tts is None:
+            try:
+                self.tts_engine = self._tts_executor.submit(self._init_tts_engine).result()
+            except Exception as e:
+                print(f"Warning: Could not initialize TTS engine: {e}")
+    
+    @property
+    def tts_available(self) -> bool:
+        """Whether any text-to-speech backend is usable"""
+        return self._edge_tts is not None or self.tts_engine is not None
+    
+    def cog_unload(self):
+        """Stop the TTS worker thread"""
+        self._tts_executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _init_tts_engine():
+        """Create and configure the pyttsx3 engine (runs on the TTS thread)"""
+        # Imported here so loading the cog doesn't pay for pyttsx3 and its
+        # platform driver unless TTS is actually set up
+        import pyttsx3
+        
+        engine = pyttsx3.init()
+        engine.setProperty('rate', 150)  # Speed
+        engine.setProperty('volume', 0.8)  # Volume
+        return engine
+    
+    def _synthesize(self, text: str) -> bytes:
+        """
+        Render text to WAV bytes (blocking, runs on the TTS thread)
+        
+        pyttsx3 can only write to a file, so each call gets its own
+        temporary WAV that is read back and deleted straight away.
+        
+        Args:
+            text: Text to speak
+            
+        Returns:
+            WAV audio data
+        """
+        tmp = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
+        tmp.close()
+        try:
+            self.tts_engine.save_to_file(text, tmp.name)
+            self.tts_engine.runAndWait()
+            with open(tmp.name, 'rb') as f:
+                return f.read()
+        finally:
+            try:
+                os.unlink(tmp.name)
+            except FileNotFoundError:
+                pass
+    
+    async def _synthesize_async(self, text: str) -> bytes:
+        """Run _synthesize on the TTS thread without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._tts_executor, self._synthesize, text)
+    
+    async def _feed_edge_tts(self, text: str, chunks: queue.Queue):
+        """
+        Push edge-tts MP3 chunks into the queue as they arrive
+        
+        Args:
+            text: Text to speak
+            chunks: Queue read by the FFmpeg stdin writer; None ends the stream
+        """
+        try:
+            communicate = self._edge_tts.Communicate(text, self.tts_voice)
+            async for chunk in communicate.stream():
+                if chunk["type"] == "audio":
+                    chunks.put(chunk["data"])
+        finally:
+            chunks.put(None)
+    
+    async def _speak(self, voice_client: discord.VoiceClient, text: str):
+        """
+        Synthesize text and play it, returning once playback finishes
+        
+        Args:
+            voice_client: Voice client to play on
+            text: Text to speak
+        """
+        if self._edge_tts is None:
+            await self._speak_offline(voice_client, text)
+            return
+        
+        # Start playback right away and feed FFmpeg while edge-tts is still
+        # synthesizing, so the first words play after the first chunk
+        chunks = queue.Queue()
+        pipe = _ChunkPipe(chunks)
+        source = discord.FFmpegPCMAudio(pipe, pipe=True)
+        feeder = asyncio.create_task(self._feed_edge_tts(text, chunks))
         try:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)  # Speed
-            self.tts_engine.setProperty('volume', 0.8)  # Volume
+            await self._play_and_wait(voice_client, source)
+        except BaseException:
+            feeder.cancel()
+            raise
+        
+        try:
+            await feeder
         except Exception as e:
-            print(f"Warning: Could not initialize TTS engine: {e}")
+            # Nothing was spoken yet (e.g. network failure): say it with
+            # pyttsx3 instead. A stream that broke off mid-sentence isn't
+            # repeated from the start
+            if pipe.received:
+                raise
+            print(f"Warning: edge-tts failed, falling back to pyttsx3: {e}")
+            await self._speak_offline(voice_client, text)
+    
+    async def _speak_offline(self, voice_client: discord.VoiceClient, text: str):
+        """
+        Synthesize text with pyttsx3 and play it, returning once playback finishes
+        
+        Args:
+            voice_client: Voice client to play on
+            text: Text to speak
+        """
+        if self.tts_engine is None:
+            loop = asyncio.get_running_loop()
+            self.tts_engine = await loop.run_in_executor(self._tts_executor, self._init_tts_engine)
+        
+        # Synthesize and stream the audio to FFmpeg over stdin
+        audio = await self._synthesize_async(text)
+        source = discord.FFmpegPCMAudio(io.BytesIO(audio), pipe=True)
+        await self._play_and_wait(voice_client, source)
+    
+    async def _play_and_wait(self, voice_client: discord.VoiceClient, source: discord.AudioSource):
+        """
+        Play a source and wait until playback finishes
+        
+        Args:
+            voice_client: Voice client to play on
+            source: Audio source to play
+        """
+        loop = asyncio.get_running_loop()
+        finished = loop.create_future()
+        
+        def _resolve(error: Optional[Exception]):
+            if not finished.done():
+                finished.set_result(error)
+        
+        # discord.py calls `after` from its audio thread once playback ends
+        voice_client.play(source, after=lambda error: loop.call_soon_threadsafe(_resolve, error))
+        
+        error = await finished
+        if error:
+            raise error
     
     @commands.command(name="join")
     async def join_voice(self, ctx: commands.Context):
@@ -81,7 +260,7 @@ class VoiceSupport(commands.Cog):
             await ctx.send("❌ I need to be in a voice channel! Use `!join` first.")
             return
         
-        if not self.tts_engine:
+        if not self.tts_available:
             await ctx.send("❌ Text-to-speech is not available on this system.")
             return
         
@@ -89,26 +268,9 @@ class VoiceSupport(commands.Cog):
             # Generate speech
             await ctx.send("🔊 Speaking...")
             
-            # Save to file
-            audio_file = "temp_speech.wav"
-            self.tts_engine.save_to_file(text, audio_file)
-            self.tts_engine.runAndWait()
-            
-            # Play audio
-            if os.path.exists(audio_file):
-                source = discord.FFmpegPCMAudio(audio_file)
-                ctx.voice_client.play(source)
-                
-                # Wait for playback to finish
-                while ctx.voice_client.is_playing():
-                    await asyncio.sleep(0.5)
-                
-                # Clean up
-                os.remove(audio_file)
+            await self._speak(ctx.voice_client, text)
         except Exception as e:
             await ctx.send(f"❌ Error: {str(e)}")
-            if os.path.exists("temp_speech.wav"):
-                os.remove("temp_speech.wav")
     
     async def speak_text(self, voice_client: discord.VoiceClient, text: str):
         """
@@ -118,26 +280,13 @@ class VoiceSupport(commands.Cog):
             voice_client: Voice client to use
             text: Text to speak
         """
-        if not self.tts_engine or not voice_client:
+        if not self.tts_available or not voice_client:
             return
         
         try:
-            audio_file = "temp_speech.wav"
-            self.tts_engine.save_to_file(text, audio_file)
-            self.tts_engine.runAndWait()
-            
-            if os.path.exists(audio_file):
-                source = discord.FFmpegPCMAudio(audio_file)
-                voice_client.play(source)
-                
-                while voice_client.is_playing():
-                    await asyncio.sleep(0.5)
-                
-                os.remove(audio_file)
+            await self._speak(voice_client, text)
         except Exception as e:
             print(f"Error in speak_text: {e}")
-            if os.path.exists("temp_speech.wav"):
-                os.remove("temp_speech.wav")
 
 
 async def setup(bot):
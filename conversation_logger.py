@@ -5,19 +5,80 @@ Supports both PostgreSQL (Railway) and SQLite (fallback)
 """
 
 import sqlite3
+import atexit
 import csv
+import io
 import os
+import sys
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import BinaryIO, List, Dict, Optional, Tuple
 from pathlib import Path
 
-# Try to import PostgreSQL handler
-try:
-    from postgres_handler import PostgresHandler
-    POSTGRES_AVAILABLE = True
-except ImportError:
-    POSTGRES_AVAILABLE = False
-    print("[INFO] PostgreSQL handler not available, using SQLite")
+
+def _import_postgres_handler():
+    """
+    Import PostgresHandler on demand so SQLite-only runs never load psycopg2
+    
+    Returns:
+        The PostgresHandler class, or None if it isn't available
+    """
+    try:
+        from postgres_handler import PostgresHandler
+        return PostgresHandler
+    except ImportError:
+        print("[INFO] PostgreSQL handler not available, using SQLite")
+        return None
+
+
+# Write buffering (both backends): rows are flushed in one transaction once this many
+# are pending, or after LOG_FLUSH_INTERVAL seconds, whichever comes first
+LOG_FLUSH_SIZE = 500
+LOG_FLUSH_INTERVAL = 1.0
+
+# Column order of every conversation SELECT, also used as the CSV header
+CONVERSATION_COLUMNS = (
+    'id', 'user_id', 'user_name', 'channel_id',
+    'user_message', 'bot_response', 'timestamp',
+    'tokens_used', 'model_used'
+)
+
+# Hot-path SQL, kept as module constants so every call hands sqlite3 the
+# exact same string and hits the connection's prepared-statement cache
+_INSERT_SQL = """
+    INSERT INTO conversations
+    (user_id, user_name, channel_id, user_message, bot_response, tokens_used, model_used)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+_UPSERT_STATS_SQL = """
+    INSERT INTO conversation_stats (model_used, cnt, tokens)
+    VALUES (?, 1, ?)
+    ON CONFLICT(model_used) DO UPDATE SET
+        cnt = cnt + 1,
+        tokens = tokens + excluded.tokens
+"""
+_INSERT_USER_SQL = "INSERT OR IGNORE INTO conversation_users (user_id) VALUES (?)"
+_SELECT_SQL = """
+    SELECT id, user_id, user_name, channel_id, user_message, bot_response,
+           timestamp, tokens_used, model_used
+    FROM conversations
+"""
+_HISTORY_BY_ID_SQL = _SELECT_SQL + "WHERE user_id = ? ORDER BY timestamp DESC LIMIT ?"
+_HISTORY_BY_NAME_SQL = _SELECT_SQL + "WHERE user_name LIKE ? ORDER BY timestamp DESC LIMIT ?"
+_HISTORY_BY_NAME_FTS_SQL = """
+    SELECT c.id, c.user_id, c.user_name, c.channel_id, c.user_message, c.bot_response,
+           c.timestamp, c.tokens_used, c.model_used
+    FROM conversations_fts f
+    JOIN conversations c ON c.id = f.rowid
+    WHERE conversations_fts MATCH ?
+    ORDER BY c.timestamp DESC
+    LIMIT ?
+"""
+_RECENT_SQL = _SELECT_SQL + "ORDER BY timestamp DESC LIMIT ?"
+_ALL_SQL = _SELECT_SQL + "ORDER BY timestamp DESC"
+
+# Bump when _create_schema changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
 
 
 class ConversationLogger:
@@ -45,10 +106,21 @@ class ConversationLogger:
         self.use_postgres = False
         self.postgres_handler = None
         
+        # Shared SQLite connection (opened by _ensure_db_exists) and the
+        # lock serializing access to it and to the pending-row buffer
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._fts_enabled = False
+        
+        # Pending rows (either backend), written in batches by _flush()
+        self._buffer: List[Tuple] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        
         # Try PostgreSQL first (Railway)
-        if self.database_url and POSTGRES_AVAILABLE:
+        postgres_handler_cls = _import_postgres_handler() if self.database_url else None
+        if postgres_handler_cls is not None:
             try:
-                self.postgres_handler = PostgresHandler(database_url=self.database_url)
+                self.postgres_handler = postgres_handler_cls(database_url=self.database_url)
                 self.use_postgres = True
                 print("[OK] Using PostgreSQL database (Railway)")
             except Exception as e:
@@ -61,12 +133,47 @@ class ConversationLogger:
             if not self.database_url:
                 print("[INFO] DATABASE_URL not set, using SQLite")
             self._ensure_db_exists()
+        
+        # Drain buffered rows (and close the SQLite connection) on shutdown
+        atexit.register(self.close)
     
     def _ensure_db_exists(self):
-        """Create database and table if they don't exist"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        """Open the shared connection and bring the schema up to SCHEMA_VERSION"""
+        # One connection for the logger's lifetime; it is used from worker
+        # threads, so access is serialized through self._lock
+        self._conn = sqlite3.connect(
+            self.db_path, check_same_thread=False, isolation_level=None, cached_statements=256
+        )
+        cursor = self._conn.cursor()
+        
+        # WAL lets the dashboard read while the bot writes, and with
+        # synchronous=NORMAL a commit no longer waits on fsync. The tradeoff:
+        # the last ~second of logged conversations may be lost on power
+        # loss (never corrupted), which is acceptable for chat logs.
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+        
+        # An up-to-date database only needs the version stamp checked
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] < SCHEMA_VERSION:
+            self._create_schema(cursor)
+            cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        else:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+            )
+            self._fts_enabled = cursor.fetchone() is not None
+        
+        # Refresh planner statistics where they are missing or stale
+        cursor.execute("PRAGMA optimize")
         
+        print(f"[OK] Conversation logger database initialized: {self.db_path}")
+    
+    def _create_schema(self, cursor: sqlite3.Cursor):
+        """Create the tables, indexes, rollups and search index (idempotent)"""
         # Table for conversation logs
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS conversations (
@@ -83,14 +190,85 @@ class ConversationLogger:
         """)
         
         # Create indexes separately (SQLite doesn't support inline INDEX)
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_id ON conversations(user_id)")
+        # (user_id, timestamp DESC) serves get_user_history's
+        # "WHERE user_id = ? ORDER BY timestamp DESC" as one range scan with
+        # no sort, and also covers plain user_id lookups
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_time ON conversations(user_id, timestamp DESC)")
+        cursor.execute("DROP INDEX IF EXISTS idx_user_id")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_channel_id ON conversations(channel_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON conversations(timestamp)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_user_name ON conversations(user_name)")
         
-        conn.commit()
-        conn.close()
-        print(f"[OK] Conversation logger database initialized: {self.db_path}")
+        # Rollup tables kept in step with conversations by _flush(), so
+        # get_stats() reads a handful of rows instead of scanning the log
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversation_stats'"
+        )
+        rollup_exists = cursor.fetchone() is not None
+        
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_stats (
+                model_used TEXT PRIMARY KEY,
+                cnt INTEGER NOT NULL DEFAULT 0,
+                tokens INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        cursor.execute("CREATE TABLE IF NOT EXISTS conversation_users (user_id TEXT PRIMARY KEY)")
+        
+        if not rollup_exists:
+            # Backfill from conversations logged before the rollup existed
+            cursor.execute("BEGIN")
+            cursor.execute("""
+                INSERT INTO conversation_stats (model_used, cnt, tokens)
+                SELECT COALESCE(model_used, 'unknown'), COUNT(*), COALESCE(SUM(tokens_used), 0)
+                FROM conversations
+                GROUP BY COALESCE(model_used, 'unknown')
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO conversation_users (user_id)
+                SELECT DISTINCT user_id FROM conversations
+            """)
+            cursor.execute("COMMIT")
+        
+        # Trigram FTS5 index over user_name so the substring search in
+        # get_user_history avoids a full scan (LIKE '%x%' can't use an index)
+        try:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'conversations_fts'"
+            )
+            fts_exists = cursor.fetchone() is not None
+            
+            cursor.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS conversations_fts USING fts5(
+                    user_name, content='conversations', content_rowid='id', tokenize='trigram'
+                )
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_insert AFTER INSERT ON conversations BEGIN
+                    INSERT INTO conversations_fts(rowid, user_name) VALUES (new.id, new.user_name);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_delete AFTER DELETE ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, user_name)
+                    VALUES ('delete', old.id, old.user_name);
+                END
+            """)
+            cursor.execute("""
+                CREATE TRIGGER IF NOT EXISTS conversations_fts_update AFTER UPDATE OF user_name ON conversations BEGIN
+                    INSERT INTO conversations_fts(conversations_fts, rowid, user_name)
+                    VALUES ('delete', old.id, old.user_name);
+                    INSERT INTO conversations_fts(rowid, user_name) VALUES (new.id, new.user_name);
+                END
+            """)
+            
+            if not fts_exists:
+                # Index conversations logged before the FTS table existed
+                cursor.execute("INSERT INTO conversations_fts(conversations_fts) VALUES ('rebuild')")
+            
+            self._fts_enabled = True
+        except sqlite3.OperationalError as e:
+            print(f"[WARNING] FTS5 trigram search unavailable, user name search will scan: {e}")
     
     def log_conversation(
         self,
@@ -101,10 +279,13 @@ class ConversationLogger:
         bot_response: str,
         tokens_used: int = 0,
         model_used: str = "unknown"
-    ) -> int:
+    ) -> Optional[int]:
         """
         Log a conversation (user message + bot response)
         
+        Rows are buffered and written in batches by _flush(), so they become
+        visible to other readers within LOG_FLUSH_INTERVAL seconds.
+        
         Args:
             user_id: Discord user ID
             user_name: Discord username/display name
@@ -115,14 +296,8 @@ class ConversationLogger:
             model_used: Model name (e.g., 'claude-3-5-haiku-20241022', 'gemini-pro', etc.)
             
         Returns:
-            Conversation ID
+            None; the row ID is only assigned when the batch is written
         """
-        if self.use_postgres and self.postgres_handler:
-            return self.postgres_handler.log_conversation(
-                user_id, user_name, channel_id, user_message, bot_response, tokens_used, model_used
-            )
-        
-        # SQLite fallback
         # Validate inputs
         if not user_id or not user_name or not channel_id:
             raise ValueError("user_id, user_name, and channel_id are required")
@@ -130,67 +305,128 @@ class ConversationLogger:
         if not user_message or not bot_response:
             raise ValueError("user_message and bot_response cannot be empty")
         
-        # Ensure values are strings (prevent SQL injection)
-        user_id = str(user_id)
-        user_name = str(user_name)[:100]  # Limit length
-        channel_id = str(channel_id)
-        model_used = str(model_used)[:50]  # Limit length
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Use parameterized query to prevent SQL injection
-        cursor.execute("""
-            INSERT INTO conversations 
-            (user_id, user_name, channel_id, user_message, bot_response, tokens_used, model_used)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (user_id, user_name, channel_id, user_message, bot_response, tokens_used, model_used))
+        # Ensure values are strings (prevent SQL injection); values that
+        # already conform are used as-is instead of being copied
+        if type(user_id) is not str:
+            user_id = str(user_id)
+        if type(user_name) is not str or len(user_name) > 100:
+            user_name = str(user_name)[:100]  # Limit length
+        if type(channel_id) is not str:
+            channel_id = str(channel_id)
+        if type(model_used) is not str or len(model_used) > 50:
+            model_used = str(model_used)[:50]  # Limit length
+        # Only a handful of model names exist, so buffered rows share one
+        # string object per model
+        model_used = sys.intern(model_used)
+        
+        row = (user_id, user_name, channel_id, user_message, bot_response, tokens_used, model_used)
+        with self._lock:
+            self._buffer.append(row)
+            pending = len(self._buffer)
+            if pending == 1 and self._flush_timer is None:
+                # First row of a new batch: make sure it is written soon
+                self._flush_timer = threading.Timer(LOG_FLUSH_INTERVAL, self._flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if pending >= LOG_FLUSH_SIZE:
+            self._flush()
+        
+        return None
+    
+    def _flush(self):
+        """Write all buffered conversations in a single transaction"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            rows, self._buffer = self._buffer, []
+        
+        if rows and self.use_postgres and self.postgres_handler:
+            # The network round-trip happens outside the lock so logging
+            # calls aren't blocked behind it
+            try:
+                self.postgres_handler.log_conversations_bulk(rows)
+            except Exception as e:
+                print(f"[ERROR] Failed to flush {len(rows)} conversation(s): {e}")
+            return
         
-        conversation_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        with self._lock:
+            if not rows or self._conn is None:
+                return
+            
+            try:
+                self._conn.execute("BEGIN")
+                # Use parameterized query to prevent SQL injection
+                self._conn.executemany(_INSERT_SQL, rows)
+                
+                # Keep the get_stats() rollups in the same transaction
+                self._conn.executemany(_UPSERT_STATS_SQL, [(row[6], row[5] or 0) for row in rows])
+                self._conn.executemany(_INSERT_USER_SQL, [(row[0],) for row in rows])
+                self._conn.execute("COMMIT")
+            except Exception as e:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                print(f"[ERROR] Failed to flush {len(rows)} conversation(s): {e}")
+    
+    def close(self):
+        """Flush pending conversations and close the SQLite connection"""
+        self._flush()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def analyze(self) -> bool:
+        """
+        Refresh the PostgreSQL statistics get_stats() estimates from
         
-        return conversation_id
+        Returns:
+            True if statistics were refreshed (PostgreSQL with a partitioned
+            conversations table), False otherwise
+        """
+        if self.use_postgres and self.postgres_handler:
+            return self.postgres_handler.analyze_conversations()
+        return False
     
-    def get_stats(self) -> Dict:
+    def get_stats(self, exact: bool = False) -> Dict:
         """
         Get conversation statistics
         
+        Args:
+            exact: On PostgreSQL, count distinct users exactly instead of
+                estimating (SQLite counts are always exact)
+        
         Returns:
             Dictionary with stats: total_conversations, total_users, total_tokens, models_used
         """
+        self._flush()
         if self.use_postgres and self.postgres_handler:
-            return self.postgres_handler.get_stats()
+            return self.postgres_handler.get_stats(exact=exact)
         
         # SQLite fallback
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total conversations
-        cursor.execute("SELECT COUNT(*) FROM conversations")
-        total_conversations = cursor.fetchone()[0]
-        
-        # Total unique users
-        cursor.execute("SELECT COUNT(DISTINCT user_id) FROM conversations")
-        total_users = cursor.fetchone()[0]
-        
-        # Total tokens used
-        cursor.execute("SELECT SUM(tokens_used) FROM conversations")
-        result = cursor.fetchone()[0]
-        total_tokens = result if result else 0
-        
-        # Models used
-        cursor.execute("SELECT DISTINCT model_used, COUNT(*) FROM conversations GROUP BY model_used")
-        models_used = {row[0]: row[1] for row in cursor.fetchall()}
-        
-        # Recent activity (last 24 hours)
-        cursor.execute("""
-            SELECT COUNT(*) FROM conversations 
-            WHERE timestamp > datetime('now', '-1 day')
-        """)
-        recent_24h = cursor.fetchone()[0]
-        
-        conn.close()
+        with self._lock:
+            cursor = self._conn.cursor()
+            
+            # Per-model conversation and token totals (rollup table)
+            cursor.execute("SELECT model_used, cnt, tokens FROM conversation_stats")
+            models_used = {}
+            total_conversations = 0
+            total_tokens = 0
+            for model, cnt, tokens in cursor.fetchall():
+                models_used[model] = cnt
+                total_conversations += cnt
+                total_tokens += tokens
+            
+            # Unique users (rollup table) and recent activity (last 24 hours,
+            # a range scan on idx_timestamp) in one round-trip
+            cursor.execute("""
+                SELECT
+                    (SELECT COUNT(*) FROM conversation_users),
+                    (SELECT COUNT(*) FROM conversations
+                     WHERE timestamp > datetime('now', '-1 day'))
+            """)
+            total_users, recent_24h = cursor.fetchone()
         
         return {
             "total_conversations": total_conversations,
@@ -217,149 +453,131 @@ class ConversationLogger:
         Returns:
             List of conversation dictionaries
         """
+        self._flush()
         if self.use_postgres and self.postgres_handler:
             return self.postgres_handler.get_user_history(user_id, user_name, limit)
         
         # SQLite fallback
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
         if user_id:
-            cursor.execute("""
-                SELECT id, user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                WHERE user_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (str(user_id), limit))
+            sql, params = _HISTORY_BY_ID_SQL, (str(user_id), limit)
+        elif user_name and self._fts_enabled and len(user_name) >= 3:
+            # Trigram index lookup; quoting makes the name a literal phrase
+            sql, params = _HISTORY_BY_NAME_FTS_SQL, ('"' + user_name.replace('"', '""') + '"', limit)
         elif user_name:
-            cursor.execute("""
-                SELECT id, user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                WHERE user_name LIKE ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (f"%{user_name}%", limit))
+            # Trigrams need at least 3 characters, shorter names scan
+            sql, params = _HISTORY_BY_NAME_SQL, (f"%{user_name}%", limit)
         else:
-            cursor.execute("""
-                SELECT id, user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-        
-        rows = cursor.fetchall()
-        conn.close()
-        
-        conversations = []
-        for row in rows:
-            conversations.append({
-                "id": row[0],
-                "user_id": row[1],
-                "user_name": row[2],
-                "channel_id": row[3],
-                "user_message": row[4],
-                "bot_response": row[5],
-                "timestamp": row[6],
-                "tokens_used": row[7],
-                "model_used": row[8]
-            })
-        
-        return conversations
+            sql, params = _RECENT_SQL, (limit,)
+        
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        
+        return [dict(zip(CONVERSATION_COLUMNS, row)) for row in rows]
     
-    def export_to_csv(self, output_path: str = "conversation_export.csv") -> str:
+    def export_to_csv(
+        self,
+        output_path: str = "conversation_export.csv",
+        file_obj: Optional[BinaryIO] = None
+    ) -> str:
         """
-        Export all conversations to CSV file
+        Export all conversations to CSV
         
         Args:
-            output_path: Path to output CSV file
+            output_path: Path to output CSV file (used as the filename only
+                when file_obj is given)
+            file_obj: Optional binary buffer (e.g. io.BytesIO) to write into
+                instead of a file on disk
             
         Returns:
             Path to exported file
         """
-        # Get all conversations (works with both PostgreSQL and SQLite)
-        conversations = self.get_all_conversations(limit=None)
+        if file_obj is not None:
+            # Write UTF-8 CSV straight into the caller's buffer, leaving it open
+            csvfile = io.TextIOWrapper(file_obj, encoding='utf-8', newline='')
+            count = self._write_csv(csvfile)
+            csvfile.flush()
+            csvfile.detach()
+        else:
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                count = self._write_csv(csvfile)
         
-        # Write to CSV
-        with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.writer(csvfile)
-            
-            # Write header
-            writer.writerow([
-                'id', 'user_id', 'user_name', 'channel_id', 
-                'user_message', 'bot_response', 'timestamp', 
-                'tokens_used', 'model_used'
-            ])
-            
-            # Write data
-            for conv in conversations:
-                writer.writerow([
-                    conv['id'],
-                    conv['user_id'],
-                    conv['user_name'],
-                    conv['channel_id'],
-                    conv['user_message'],
-                    conv['bot_response'],
-                    conv['timestamp'],
-                    conv['tokens_used'],
-                    conv['model_used']
-                ])
-        
-        print(f"[OK] Exported {len(conversations)} conversations to {output_path}")
+        if file_obj is not None:
+            print(f"[OK] Exported {count} conversations to buffer")
+        else:
+            print(f"[OK] Exported {count} conversations to {output_path}")
         return output_path
     
-    def get_all_conversations(self, limit: Optional[int] = None) -> List[Dict]:
+    def _write_csv(self, csvfile) -> int:
         """
-        Get all conversations (for export or analysis)
+        Stream the CSV header and one row per conversation into csvfile
+        
+        Rows go straight from the database cursor to the writer, so the
+        export never holds the whole table in memory.
+        
+        Returns:
+            Number of conversations written
+        """
+        self._flush()
+        if self.use_postgres and self.postgres_handler:
+            return self.postgres_handler.export_to_csv(csvfile)
+        
+        writer = csv.writer(csvfile)
+        
+        # Write header
+        writer.writerow(CONVERSATION_COLUMNS)
+        
+        # Write data
+        count = 0
+        for row in self._iter_all_rows():
+            writer.writerow(row)
+            count += 1
+        
+        return count
+    
+    def _iter_all_rows(self, chunk_size: int = 2000):
+        """
+        Yield every conversation row, newest first, without fetchall
+        
+        Reads through its own read-only connection instead of the shared
+        one, so a long export doesn't hold self._lock; under WAL, logging
+        keeps committing while the export reads its snapshot.
+        """
+        conn = sqlite3.connect(Path(self.db_path).resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            cursor = conn.execute(_ALL_SQL)
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+    
+    def get_all_conversations(self, limit: int) -> List[Dict]:
+        """
+        Get the most recent conversations (for export or analysis)
         
         Args:
-            limit: Maximum number to return (None for all)
+            limit: Maximum number to return; required, since a list of the
+                whole table grows without bound (use export_to_csv() to
+                export everything)
             
         Returns:
-            List of all conversations
+            List of conversations, newest first
         """
+        if not limit:
+            raise ValueError(
+                "get_all_conversations() needs a limit; use export_to_csv() "
+                "to export every conversation"
+            )
+        
+        self._flush()
         if self.use_postgres and self.postgres_handler:
             return self.postgres_handler.get_all_conversations(limit)
         
         # SQLite fallback
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        if limit:
-            cursor.execute("""
-                SELECT id, user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                ORDER BY timestamp DESC
-                LIMIT ?
-            """, (limit,))
-        else:
-            cursor.execute("""
-                SELECT id, user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                ORDER BY timestamp DESC
-            """)
+        with self._lock:
+            rows = self._conn.execute(_RECENT_SQL, (limit,)).fetchall()
         
-        rows = cursor.fetchall()
-        conn.close()
-        
-        conversations = []
-        for row in rows:
-            conversations.append({
-                "id": row[0],
-                "user_id": row[1],
-                "user_name": row[2],
-                "channel_id": row[3],
-                "user_message": row[4],
-                "bot_response": row[5],
-                "timestamp": row[6],
-                "tokens_used": row[7],
-                "model_used": row[8]
-            })
-        
-        return conversations
+        return [dict(zip(CONVERSATION_COLUMNS, row)) for row in rows]
 
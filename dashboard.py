@@ -4,11 +4,20 @@ Web Dashboard - Simple Flask dashboard to monitor bot stats
 
 from flask import Flask, render_template_string, jsonify
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 import os
 
 app = Flask(__name__)
 
+# Seconds the 7-day stats are shared between requests (page loads, the
+# 30s auto-refresh, and /api/stats pollers all hit the same query)
+STATS_CACHE_TTL = 10
+
+_stats_cache = {"value": None, "expires": 0.0}
+_stats_cache_lock = threading.Lock()
+
 # Dashboard HTML template
 DASHBOARD_HTML = """
 <!DOCTYPE html>
@@ -144,13 +153,11 @@ def get_db_connection():
     return conn
 
 
-@app.route('/')
-def dashboard():
-    """Main dashboard page"""
+def _query_stats() -> dict:
+    """Run the 7-day stats aggregation against the database"""
     conn = get_db_connection()
     
     try:
-        # Get stats from last 7 days
         cursor = conn.execute("""
             SELECT SUM(message_count) as total_messages,
                    SUM(command_count) as total_commands,
@@ -160,12 +167,32 @@ def dashboard():
         """)
         
         row = cursor.fetchone()
-        stats = {
+        return {
             "total_messages": row["total_messages"] or 0,
             "total_commands": row["total_commands"] or 0,
-            "servers": row["servers"] or 0,
-            "uptime": "Active"
+            "servers": row["servers"] or 0
         }
+    finally:
+        conn.close()
+
+
+def get_cached_stats() -> dict:
+    """Return the 7-day stats, re-querying at most once per STATS_CACHE_TTL"""
+    with _stats_cache_lock:
+        now = time.monotonic()
+        if _stats_cache["value"] is None or now >= _stats_cache["expires"]:
+            # Errors propagate without touching the cache
+            _stats_cache["value"] = _query_stats()
+            _stats_cache["expires"] = now + STATS_CACHE_TTL
+        return dict(_stats_cache["value"])
+
+
+@app.route('/')
+def dashboard():
+    """Main dashboard page"""
+    try:
+        stats = get_cached_stats()
+        stats["uptime"] = "Active"
     except Exception as e:
         stats = {
             "total_messages": 0,
@@ -173,8 +200,6 @@ def dashboard():
             "servers": 0,
             "uptime": "Unknown"
         }
-    finally:
-        conn.close()
     
     return render_template_string(DASHBOARD_HTML, stats=stats)
 
@@ -182,30 +207,23 @@ def dashboard():
 @app.route('/api/stats')
 def api_stats():
     """API endpoint for stats"""
-    conn = get_db_connection()
-    
     try:
-        cursor = conn.execute("""
-            SELECT SUM(message_count) as total_messages,
-                   SUM(command_count) as total_commands,
-                   COUNT(DISTINCT server_id) as servers
-            FROM bot_stats
-            WHERE date >= date('now', '-7 days')
-        """)
-        
-        row = cursor.fetchone()
-        return jsonify({
-            "total_messages": row["total_messages"] or 0,
-            "total_commands": row["total_commands"] or 0,
-            "servers": row["servers"] or 0
-        })
+        response = jsonify(get_cached_stats())
+        response.headers["Cache-Control"] = f"max-age={STATS_CACHE_TTL}"
+        return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
-    finally:
-        conn.close()
 
 
 if __name__ == '__main__':
     port = int(os.getenv("DASHBOARD_PORT", 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    
+    # Prefer waitress (multi-threaded, HTTP keep-alive); fall back to
+    # Flask's server with threading enabled if it isn't installed
+    try:
+        from waitress import serve
+        serve(app, host='0.0.0.0', port=port, threads=int(os.getenv("DASHBOARD_THREADS", 8)))
+    except ImportError:
+        print("[INFO] waitress not installed, using Flask's built-in server")
+        app.run(host='0.0.0.0', port=port, debug=False, threaded=True)
 
@@ -12,6 +12,12 @@ import sqlite3
 import sys
 from conversation_logger import ConversationLogger
 
+# Rows fetched from SQLite and sent to PostgreSQL per COPY
+MIGRATION_CHUNK_SIZE = 50000
+
+# Rows per committed INSERT batch when a chunk has to fall back from COPY
+INSERT_BATCH_SIZE = 1000
+
 def migrate_conversations():
     """Migrate conversations from SQLite to PostgreSQL"""
     
@@ -56,45 +62,73 @@ def migrate_conversations():
             sqlite_conn = sqlite3.connect(sqlite_conversations_db)
             cursor = sqlite_conn.cursor()
             
-            # Get all conversations
-            cursor.execute("""
-                SELECT user_id, user_name, channel_id, user_message, bot_response, 
-                       timestamp, tokens_used, model_used
-                FROM conversations
-                ORDER BY timestamp ASC
-            """)
-            
-            rows = cursor.fetchall()
-            total = len(rows)
+            # Count conversations up front for progress reporting
+            cursor.execute("SELECT COUNT(*) FROM conversations")
+            total = cursor.fetchone()[0]
             print(f"[INFO] Found {total} conversations to migrate")
             
             if total > 0:
+                if not postgres_logger.use_postgres:
+                    print("[ERROR] PostgreSQL is not active, refusing to migrate into SQLite")
+                    sqlite_conn.close()
+                    return False
+                
                 migrated = 0
                 skipped = 0
                 
-                for row in rows:
-                    user_id, user_name, channel_id, user_message, bot_response, timestamp, tokens_used, model_used = row
+                # Stream conversations in chunks, one COPY per chunk
+                cursor.execute("""
+                    SELECT user_id, user_name, channel_id, user_message, bot_response, 
+                           timestamp, tokens_used, model_used
+                    FROM conversations
+                    ORDER BY timestamp ASC
+                """)
+                
+                while True:
+                    chunk = cursor.fetchmany(MIGRATION_CHUNK_SIZE)
+                    if not chunk:
+                        break
                     
-                    try:
-                        # Log to PostgreSQL
-                        postgres_logger.log_conversation(
-                            user_id=str(user_id),
-                            user_name=str(user_name),
-                            channel_id=str(channel_id),
-                            user_message=str(user_message),
-                            bot_response=str(bot_response),
-                            tokens_used=tokens_used or 0,
-                            model_used=str(model_used) if model_used else "unknown"
-                        )
-                        migrated += 1
+                    rows = []
+                    for row in chunk:
+                        user_id, user_name, channel_id, user_message, bot_response, timestamp, tokens_used, model_used = row
+                        
+                        # Same required fields as log_conversation
+                        if not (user_id and user_name and channel_id and user_message and bot_response):
+                            skipped += 1
+                            continue
                         
-                        if migrated % 100 == 0:
-                            print(f"[INFO] Migrated {migrated}/{total} conversations...")
+                        rows.append((
+                            str(user_id),
+                            str(user_name)[:100],
+                            str(channel_id),
+                            str(user_message),
+                            str(bot_response),
+                            timestamp,
+                            tokens_used or 0,
+                            str(model_used)[:50] if model_used else "unknown"
+                        ))
                     
+                    try:
+                        migrated += postgres_logger.postgres_handler.log_conversations_bulk(
+                            rows, with_timestamp=True, durable=True, use_copy=True
+                        )
                     except Exception as e:
-                        print(f"[WARNING] Failed to migrate conversation {row[0]}: {e}")
-                        skipped += 1
-                        continue
+                        # One bad row fails the whole COPY; retry the chunk in
+                        # smaller batched INSERTs so only the bad batch is lost
+                        print(f"[WARNING] COPY failed for a chunk of {len(rows)} conversations: {e}")
+                        print("[INFO] Retrying chunk with batched INSERTs...")
+                        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                            batch = rows[start:start + INSERT_BATCH_SIZE]
+                            try:
+                                migrated += postgres_logger.postgres_handler.log_conversations_bulk(
+                                    batch, with_timestamp=True, durable=True, use_copy=False
+                                )
+                            except Exception as batch_error:
+                                print(f"[WARNING] Failed to migrate {len(batch)} conversations: {batch_error}")
+                                skipped += len(batch)
+                    
+                    print(f"[INFO] Migrated {migrated}/{total} conversations...")
                 
                 print(f"\n[OK] Migration complete!")
                 print(f"  - Migrated: {migrated}")
@@ -120,7 +154,7 @@ def migrate_conversations():
     # Verify migration
     print("\n[INFO] Verifying migration...")
     try:
-        stats = postgres_logger.get_stats()
+        stats = postgres_logger.get_stats(exact=True)
         print(f"[OK] PostgreSQL now has:")
         print(f"  - Total conversations: {stats['total_conversations']}")
         print(f"  - Total users: {stats['total_users']}")
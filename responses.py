@@ -4,14 +4,10 @@ All pre-written responses organized by category
 Includes Kurdish (Sorani and Kurmanji) support
 """
 
+import re
 from datetime import datetime
-
-# Import Kurdish detector for language-aware responses
-try:
-    from utils.kurdish_detector import KurdishDetector
-    KURDISH_DETECTOR_AVAILABLE = True
-except ImportError:
-    KURDISH_DETECTOR_AVAILABLE = False
+from functools import lru_cache
+from typing import Optional
 
 
 # Dictionary of keywords and their responses
@@ -65,7 +61,8 @@ RESPONSES = {
     },
     "time": {
         "keywords": ["time", "what time", "clock"],
-        "response": f"I don't have a clock, but I hope you're having a good time! ⏰ (Current time: {datetime.now().strftime('%I:%M %p')})"
+        # Callable so the time is read when the response is sent
+        "response": lambda: f"I don't have a clock, but I hope you're having a good time! ⏰ (Current time: {datetime.now().strftime('%I:%M %p')})"
     },
     
     # Default response (used when no keywords match)
@@ -132,6 +129,62 @@ KURDISH_KURMANJI_RESPONSES = {
 }
 
 
+def _build_matcher(responses_dict: dict):
+    """
+    Flatten a response dict into a single regex scan plus lookup tables
+    
+    Every keyword becomes its own capture group, alternated in the order
+    find_response used to try them (category order, then keyword order),
+    inside a lookahead so every position is tested. At each position the
+    first alternative that matches is the highest-priority keyword
+    starting there, and match.lastindex is that priority, so the lowest
+    lastindex over one pass is the keyword the nested loops would have
+    found first.
+    
+    Args:
+        responses_dict: One of the *RESPONSES dicts
+        
+    Returns:
+        Tuple of (compiled pattern, responses indexed by group number - 1,
+        default response)
+    """
+    keywords = []
+    responses = []
+    for category, data in responses_dict.items():
+        # Skip default category
+        if category == "default":
+            continue
+        for keyword in data["keywords"]:
+            keywords.append(keyword)
+            responses.append(data["response"])
+    
+    pattern = re.compile(
+        "(?=(?:" + "|".join("(" + re.escape(keyword) + ")" for keyword in keywords) + "))"
+    )
+    return pattern, tuple(responses), responses_dict["default"]["response"]
+
+
+def _match_response(matcher, *texts: str):
+    """
+    Find the response for the highest-priority keyword in any of the texts
+    
+    Args:
+        matcher: Result of _build_matcher()
+        texts: Strings to scan
+        
+    Returns:
+        The matching response (a string, or a callable for dynamic
+        responses), or the dict's default response
+    """
+    pattern, responses, default = matcher
+    best = None
+    for text in texts:
+        for match in pattern.finditer(text):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+    return default if best is None else responses[best - 1]
+
+
 def find_response(message: str, detected_language: str = None, kurdish_dialect: str = None) -> str:
     """
     Find appropriate response based on message content
@@ -145,57 +198,74 @@ def find_response(message: str, detected_language: str = None, kurdish_dialect:
         Response string
     """
     # Detect Kurdish if not provided
-    if KURDISH_DETECTOR_AVAILABLE and detected_language is None:
-        lang_result = KurdishDetector.detect_language(message)
-        detected_language = lang_result[0]
-        if detected_language == 'ku':
-            kurdish_result = KurdishDetector.detect_kurdish(message)
-            if kurdish_result:
-                kurdish_dialect, _ = kurdish_result
-    
-    # Handle Kurdish responses
-    if detected_language == 'ku':
-        if kurdish_dialect == 'sorani':
-            responses_dict = KURDISH_SORANI_RESPONSES
-        elif kurdish_dialect == 'kurmanji':
-            responses_dict = KURDISH_KURMANJI_RESPONSES
-        else:
-            # Default to Sorani if dialect unknown
-            responses_dict = KURDISH_SORANI_RESPONSES
-        
-        message_lower = message.lower()
-        message_original = message
-        
-        # Check each response category
-        for category, data in responses_dict.items():
-            # Skip default category
-            if category == "default":
-                continue
-            
-            # Check if any keyword matches
-            for keyword in data["keywords"]:
-                if keyword in message_lower or keyword in message_original:
-                    return data["response"]
+    if detected_language is None:
+        kurdish_dialect = _detect_kurdish_dialect(message)
+        if kurdish_dialect is not None:
+            detected_language = 'ku'
+    
+    response = _find_response_cached(message, detected_language, kurdish_dialect)
+    return response() if callable(response) else response
+
+
+@lru_cache(maxsize=None)
+def _load_kurdish_detector():
+    """
+    Import the Kurdish detector on first use
+    
+    Returns:
+        KurdishDetector class, or None if it isn't available
+    """
+    try:
+        from utils.kurdish_detector import KurdishDetector
+    except ImportError:
+        return None
+    return KurdishDetector
+
+
+@lru_cache(maxsize=2048)
+def _detect_kurdish_dialect(message: str) -> Optional[str]:
+    """
+    Detect whether a message is Kurdish, and in which dialect
+    
+    KurdishDetector.detect_language() is itself a detect_kurdish() call
+    plus an Arabic check, and Arabic and English share the same responses
+    here, so a single detect_kurdish() pass decides everything
+    find_response needs.
+    
+    Args:
+        message: User's message text
         
-        # No match found, return default Kurdish response
-        return responses_dict["default"]["response"]
+    Returns:
+        'sorani' or 'kurmanji', or None if the message isn't Kurdish
+    """
+    detector = _load_kurdish_detector()
+    if detector is None:
+        return None
     
-    # English/Arabic responses (original logic)
-    message_lower = message.lower()
+    kurdish_result = detector.detect_kurdish(message)
+    if kurdish_result:
+        return kurdish_result[0]
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _find_response_cached(message: str, detected_language: str, kurdish_dialect: str):
+    """
+    Memoized body of find_response
     
-    # Check each response category
-    for category, data in RESPONSES.items():
-        # Skip default category
-        if category == "default":
-            continue
+    Repeated messages ("hi", "thanks", ...) skip the keyword scan. Dynamic
+    responses are cached as their callable and called by find_response,
+    so a cached "time" answer still shows the current time.
+    """
+    # Handle Kurdish responses (Sorani if the dialect is unknown)
+    if detected_language == 'ku':
+        matcher = _KURDISH_MATCHERS.get(kurdish_dialect, _SORANI_MATCHER)
         
-        # Check if any keyword matches
-        for keyword in data["keywords"]:
-            if keyword in message_lower:
-                return data["response"]
+        # Keywords may match either the lowercased or the original text
+        return _match_response(matcher, message.lower(), message)
     
-    # No match found, return default response
-    return RESPONSES["default"]["response"]
+    # English/Arabic responses (original logic)
+    return _match_response(_EN_MATCHER, message.lower())
 
 
 def get_reaction(message: str) -> str:
@@ -211,7 +281,7 @@ def get_reaction(message: str) -> str:
     message_lower = message.lower()
     
     # Positive messages get 👍
-    if any(word in message_lower for word in ["thank", "thanks", "good", "great", "awesome", "love"]):
+    if _POSITIVE_RE.search(message_lower):
         return "👍"
     
     # Questions get ❓
@@ -219,9 +289,19 @@ def get_reaction(message: str) -> str:
         return "❓"
     
     # Fun messages get ❤️
-    if any(word in message_lower for word in ["joke", "funny", "haha", "lol"]):
+    if _FUN_RE.search(message_lower):
         return "❤️"
     
     # Default reaction
     return "👋"
 
+
+# Keyword scanners, built once at import
+_EN_MATCHER = _build_matcher(RESPONSES)
+_SORANI_MATCHER = _build_matcher(KURDISH_SORANI_RESPONSES)
+_KURMANJI_MATCHER = _build_matcher(KURDISH_KURMANJI_RESPONSES)
+_KURDISH_MATCHERS = {"sorani": _SORANI_MATCHER, "kurmanji": _KURMANJI_MATCHER}
+
+# Reaction words, matched as whole words so "goodbye" isn't "good"
+_POSITIVE_RE = re.compile(r"\b(?:thank|thanks|good|great|awesome|love)\b")
+_FUN_RE = re.compile(r"\b(?:joke|funny|haha|lol)\b")
@@ -3,32 +3,302 @@ Advanced Analytics and Tracking System
 Tracks detailed statistics for users, servers, APIs, and interactions
 """
 
+import asyncio
 import sqlite3
 import aiosqlite
-from typing import Dict, List, Optional, Tuple
-from datetime import datetime, timedelta
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 import json
+import time
+
+# log_interaction()/log_command() events are written in batches of up to this many...
+ANALYTICS_FLUSH_SIZE = 200
+
+# ...or after waiting this many seconds for the batch to fill
+ANALYTICS_FLUSH_INTERVAL = 0.1
+
+# Characters of query_text/bot_response kept in interactions when full
+# bodies aren't stored (nothing here reads them; they're for auditing)
+ANALYTICS_BODY_PREVIEW_CHARS = 256
+
+# maintenance() only VACUUMs once this share of the file is free pages
+VACUUM_FREE_RATIO = 0.2
+
+# PRAGMA user_version of a fully migrated analytics database
+# (1: stats tables keyed WITHOUT ROWID)
+ANALYTICS_SCHEMA_VERSION = 1
+
+# Seconds get_global_stats()/get_cost_analytics() results are reused
+STATS_CACHE_TTL = 30
+
+
+# Write statements for the interaction writer, parsed once per connection
+# by sqlite3's statement cache
+_INSERT_INTERACTION_SQL = """
+    INSERT INTO interactions 
+    (user_id, username, server_id, channel_id, query_text, bot_response,
+     api_provider, response_time, tokens_used, cost, language_detected,
+     success, error_message)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_USER_STATS_SQL = """
+    INSERT INTO user_stats 
+    (user_id, username, total_messages, total_tokens, total_cost, 
+     first_seen, last_seen)
+    VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(user_id) DO UPDATE SET
+        username = excluded.username,
+        total_messages = total_messages + excluded.total_messages,
+        total_tokens = total_tokens + excluded.total_tokens,
+        total_cost = total_cost + excluded.total_cost,
+        last_seen = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_UPSERT_SERVER_STATS_SQL = """
+    INSERT INTO server_stats 
+    (server_id, total_messages, total_tokens, total_cost,
+     first_seen, last_seen)
+    VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+    ON CONFLICT(server_id) DO UPDATE SET
+        total_messages = total_messages + excluded.total_messages,
+        total_tokens = total_tokens + excluded.total_tokens,
+        total_cost = total_cost + excluded.total_cost,
+        last_seen = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+_UPSERT_API_USAGE_SQL = """
+    INSERT INTO api_usage 
+    (api_provider, date, calls, errors, total_tokens, total_cost, sum_response_time)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(api_provider, date) DO UPDATE SET
+        calls = calls + excluded.calls,
+        errors = errors + excluded.errors,
+        total_tokens = total_tokens + excluded.total_tokens,
+        total_cost = total_cost + excluded.total_cost,
+        sum_response_time = sum_response_time + excluded.sum_response_time
+"""
+
+_UPSERT_DAILY_ROLLUP_SQL = """
+    INSERT INTO daily_rollup
+    (date, api_provider, language, calls, tokens, cost, sum_response_time, errors)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(date, api_provider, language) DO UPDATE SET
+        calls = calls + excluded.calls,
+        tokens = tokens + excluded.tokens,
+        cost = cost + excluded.cost,
+        sum_response_time = sum_response_time + excluded.sum_response_time,
+        errors = errors + excluded.errors
+"""
+
+_INSERT_INTERACTION_BODY_SQL = """
+    INSERT INTO interaction_bodies (interaction_id, query_text, bot_response)
+    VALUES (?, ?, ?)
+"""
+
+_INSERT_COMMAND_SQL = """
+    INSERT INTO command_usage (command_name, user_id, server_id)
+    VALUES (?, ?, ?)
+"""
+
+_INSERT_SERVER_MEMBER_SQL = """
+    INSERT OR IGNORE INTO server_members (server_id, user_id) VALUES (?, ?)
+"""
+
+_UPSERT_LANGUAGE_USAGE_SQL = """
+    INSERT INTO language_usage 
+    (language_code, usage_count, last_used)
+    VALUES (?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(language_code) DO UPDATE SET
+        usage_count = usage_count + excluded.usage_count,
+        last_used = CURRENT_TIMESTAMP,
+        updated_at = CURRENT_TIMESTAMP
+"""
+
+
+# get_leaderboard() queries by category; fixed strings, so no SQL is
+# built from input and each one stays in the statement cache
+_LEADERBOARD_SQL = {
+    "messages": "SELECT user_id, total_messages FROM user_stats ORDER BY total_messages DESC LIMIT ?",
+    "tokens": "SELECT user_id, total_tokens FROM user_stats ORDER BY total_tokens DESC LIMIT ?",
+    "cost": "SELECT user_id, total_cost FROM user_stats ORDER BY total_cost DESC LIMIT ?",
+}
 
 
 class AnalyticsTracker:
     """Tracks comprehensive analytics for the bot"""
     
-    def __init__(self, db_path: str = "analytics.db"):
+    def __init__(self, db_path: str = "analytics.db", store_bodies: bool = False):
         """
         Initialize analytics tracker
         
         Args:
             db_path: Path to SQLite database
+            store_bodies: Keep full queries/responses in interaction_bodies
+                instead of a short preview in interactions
         """
         self.db_path = db_path
+        self.store_bodies = store_bodies
+        
+        # Set once initialize() has finished; callers check it before
+        # awaiting initialize(), and _init_lock makes concurrent first
+        # calls wait for a single initialization
         self._initialized = False
+        self._init_lock = asyncio.Lock()
+        
+        # One long-lived connection instead of a connect() per call, so
+        # SQLite's page cache and statement cache stay warm. aiosqlite runs
+        # it on its own thread; writers take _write_lock so concurrent
+        # log_* calls can't commit each other's half-done transactions.
+        self._db: Optional[aiosqlite.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._write_lock = asyncio.Lock()
+        
+        # Write-behind queue of (kind, row, date) events from
+        # log_interaction() and log_command(), and the task that drains it;
+        # both are created by initialize() inside the event loop
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # (method name, days) -> (computed_at, stats) for the windowed stats
+        self._stats_cache: Dict[Tuple[str, int], Tuple[float, Dict]] = {}
+    
+    async def _get_db(self) -> aiosqlite.Connection:
+        """Open the shared connection on first use"""
+        if self._db is None:
+            async with self._connect_lock:
+                if self._db is None:
+                    db = await aiosqlite.connect(self.db_path)
+                    
+                    # Per-connection settings, applied once since the
+                    # connection is kept: WAL lets the stats reads run
+                    # alongside logging, NORMAL skips the fsync on every
+                    # commit (WAL stays consistent), and busy_timeout waits
+                    # out other processes' locks instead of failing
+                    await db.executescript("""
+                        PRAGMA journal_mode=WAL;
+                        PRAGMA synchronous=NORMAL;
+                        PRAGMA busy_timeout=5000;
+                        PRAGMA cache_size=-64000;
+                        PRAGMA temp_store=MEMORY;
+                    """)
+                    
+                    # Rows support both row[0] and row["column"], and
+                    # dict(row) for the stats getters
+                    db.row_factory = aiosqlite.Row
+                    self._db = db
+        return self._db
+    
+    @asynccontextmanager
+    async def _connection(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow the shared connection for reads"""
+        yield await self._get_db()
+    
+    @asynccontextmanager
+    async def _transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        """Borrow the shared connection for one write transaction"""
+        db = await self._get_db()
+        async with self._write_lock:
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+    
+    async def close(self):
+        """Write out queued events and close the shared connection"""
+        if self._writer_task is not None:
+            await self.flush()
+            self._writer_task.cancel()
+            self._writer_task = None
+        
+        if self._db is not None:
+            # Refresh planner statistics for tables whose shape changed
+            await self._db.execute("PRAGMA optimize")
+            await self._db.close()
+            self._db = None
+    
+    async def maintenance(self) -> Dict:
+        """
+        Periodic upkeep: checkpoint the WAL, refresh planner statistics and
+        VACUUM when enough of the file is free pages
+        
+        Returns:
+            Dict with 'free_pages', 'page_count' and 'vacuumed'
+        """
+        if not self._initialized:
+            await self.initialize()
+        await self.flush()
+        
+        async with self._transaction() as db:
+            await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            await db.execute("ANALYZE")
+            await db.execute("PRAGMA optimize")
+            await db.commit()
+            
+            async with db.execute("PRAGMA freelist_count") as cursor:
+                free_pages = (await cursor.fetchone())[0]
+            async with db.execute("PRAGMA page_count") as cursor:
+                page_count = (await cursor.fetchone())[0]
+            
+            vacuumed = page_count > 0 and free_pages / page_count > VACUUM_FREE_RATIO
+            if vacuumed:
+                await db.execute("VACUUM")
+                await db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        
+        return {'free_pages': free_pages, 'page_count': page_count, 'vacuumed': vacuumed}
     
     async def initialize(self):
-        """Initialize database tables"""
+        """Initialize database tables and start the background writer (once)"""
         if self._initialized:
             return
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._init_lock:
+            if self._initialized:
+                return
+            
+            await self._create_schema()
+            self._queue = asyncio.Queue()
+            self._writer_task = asyncio.create_task(self._drain())
+            self._initialized = True
+    
+    async def _create_schema(self):
+        """Create or migrate tables and indexes"""
+        async with self._transaction() as db:
+            # Timestamps are INTEGER Unix epoch seconds (UTC). Tables from
+            # before that stored CURRENT_TIMESTAMP text; move them aside
+            # here and copy their rows into the new tables below.
+            legacy_tables = []
+            for table in ("interactions", "command_usage"):
+                async with db.execute(f"PRAGMA table_info({table})") as cursor:
+                    timestamp_type = {row[1]: row[2] async for row in cursor}.get("timestamp")
+                if timestamp_type is not None and timestamp_type.upper() != "INTEGER":
+                    await db.execute(f"ALTER TABLE {table} RENAME TO {table}_text_ts")
+                    legacy_tables.append(table)
+            
+            # The stats tables are WITHOUT ROWID, so each upsert writes the
+            # row into its primary-key B-tree only, instead of a rowid table
+            # plus a separate key index. Databases from before schema
+            # version 1 have them as rowid tables; move those aside too.
+            async with db.execute("PRAGMA user_version") as cursor:
+                schema_version = (await cursor.fetchone())[0]
+            rowid_stats_tables = []
+            if schema_version < 1:
+                for table, key in (("user_stats", "user_id"), ("server_stats", "server_id"),
+                                   ("language_usage", "language_code")):
+                    async with db.execute(f"PRAGMA table_info({table})") as cursor:
+                        columns = [row[1] async for row in cursor]
+                    if columns:
+                        if table == "server_stats":
+                            # Renaming would repoint the trigger; it is
+                            # recreated below
+                            await db.execute("DROP TRIGGER IF EXISTS server_members_count")
+                        await db.execute(f"ALTER TABLE {table} RENAME TO {table}_rowid")
+                        rowid_stats_tables.append((table, key, ", ".join(columns)))
+            
             # Interactions table - tracks every interaction
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS interactions (
@@ -43,13 +313,23 @@ class AnalyticsTracker:
                     response_time REAL,
                     tokens_used INTEGER,
                     cost REAL,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
                     language_detected TEXT,
                     success BOOLEAN DEFAULT 1,
                     error_message TEXT
                 )
             """)
             
+            # Full query/response text, kept out of interactions so scans
+            # of it never read body text (only written with store_bodies)
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS interaction_bodies (
+                    interaction_id INTEGER PRIMARY KEY REFERENCES interactions(id),
+                    query_text TEXT,
+                    bot_response TEXT
+                )
+            """)
+            
             # User statistics table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS user_stats (
@@ -63,7 +343,7 @@ class AnalyticsTracker:
                     first_seen DATETIME,
                     last_seen DATETIME,
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             """)
             
             # Server statistics table
@@ -78,10 +358,12 @@ class AnalyticsTracker:
                     first_seen DATETIME,
                     last_seen DATETIME,
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
+                ) WITHOUT ROWID
             """)
             
-            # API usage table - tracks API performance
+            # API usage table - tracks API performance. The average
+            # response time is sum_response_time / calls, computed on read;
+            # keeping a running average in the row drifts with every update.
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS api_usage (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -91,11 +373,19 @@ class AnalyticsTracker:
                     errors INTEGER DEFAULT 0,
                     total_tokens INTEGER DEFAULT 0,
                     total_cost REAL DEFAULT 0.0,
-                    avg_response_time REAL DEFAULT 0.0,
+                    sum_response_time REAL DEFAULT 0.0,
                     UNIQUE(api_provider, date)
                 )
             """)
             
+            # Tables from before sum_response_time kept avg_response_time;
+            # seed the sum from it (that column is no longer updated)
+            async with db.execute("PRAGMA table_info(api_usage)") as cursor:
+                api_usage_columns = {row[1] async for row in cursor}
+            if "sum_response_time" not in api_usage_columns:
+                await db.execute("ALTER TABLE api_usage ADD COLUMN sum_response_time REAL DEFAULT 0.0")
+                await db.execute("UPDATE api_usage SET sum_response_time = avg_response_time * calls")
+            
             # Command usage table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS command_usage (
@@ -103,10 +393,35 @@ class AnalyticsTracker:
                     command_name TEXT NOT NULL,
                     user_id TEXT,
                     server_id TEXT,
-                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+                    timestamp INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
                 )
             """)
             
+            if "interactions" in legacy_tables:
+                await db.execute("""
+                    INSERT INTO interactions
+                    (id, user_id, username, server_id, channel_id, query_text, bot_response,
+                     api_provider, response_time, tokens_used, cost, timestamp,
+                     language_detected, success, error_message)
+                    SELECT id, user_id, username, server_id, channel_id, query_text, bot_response,
+                           api_provider, response_time, tokens_used, cost,
+                           COALESCE(CAST(strftime('%s', timestamp) AS INTEGER),
+                                    CAST(strftime('%s', 'now') AS INTEGER)),
+                           language_detected, success, error_message
+                    FROM interactions_text_ts
+                """)
+                await db.execute("DROP TABLE interactions_text_ts")
+            
+            if "command_usage" in legacy_tables:
+                await db.execute("""
+                    INSERT INTO command_usage (id, command_name, user_id, server_id, timestamp)
+                    SELECT id, command_name, user_id, server_id,
+                           COALESCE(CAST(strftime('%s', timestamp) AS INTEGER),
+                                    CAST(strftime('%s', 'now') AS INTEGER))
+                    FROM command_usage_text_ts
+                """)
+                await db.execute("DROP TABLE command_usage_text_ts")
+            
             # Language distribution table
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS language_usage (
@@ -114,20 +429,269 @@ class AnalyticsTracker:
                     usage_count INTEGER DEFAULT 0,
                     last_used DATETIME,
                     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+                ) WITHOUT ROWID
+            """)
+            
+            for table, key, columns in rowid_stats_tables:
+                await db.execute(f"""
+                    INSERT INTO {table} ({columns})
+                    SELECT {columns} FROM {table}_rowid WHERE {key} IS NOT NULL
+                """)
+                await db.execute(f"DROP TABLE {table}_rowid")
+            
+            # Users seen per server. Only a pair's first insert fires the
+            # trigger, which keeps server_stats.total_users current so
+            # get_server_stats doesn't count distinct users on every call
+            async with db.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'server_members'
+            """) as cursor:
+                new_members = await cursor.fetchone() is None
+            
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS server_members (
+                    server_id TEXT NOT NULL,
+                    user_id TEXT NOT NULL,
+                    PRIMARY KEY (server_id, user_id)
+                ) WITHOUT ROWID
+            """)
+            
+            if new_members:
+                await db.execute("""
+                    INSERT OR IGNORE INTO server_members (server_id, user_id)
+                    SELECT DISTINCT server_id, user_id FROM interactions
+                    WHERE server_id IS NOT NULL AND server_id != ''
+                """)
+                await db.execute("""
+                    UPDATE server_stats SET total_users = (
+                        SELECT COUNT(*) FROM server_members
+                        WHERE server_members.server_id = server_stats.server_id
+                    )
+                """)
+            
+            await db.execute("""
+                CREATE TRIGGER IF NOT EXISTS server_members_count
+                AFTER INSERT ON server_members
+                BEGIN
+                    UPDATE server_stats SET total_users = total_users + 1
+                    WHERE server_id = NEW.server_id;
+                END
+            """)
+            
+            # Per-day totals by API and language, kept up to date by the
+            # interaction writer, so the windowed stats read a few rows per
+            # day instead of every interaction. '' stands for "none" since
+            # NULLs would never conflict in the primary key.
+            async with db.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'daily_rollup'
+            """) as cursor:
+                new_rollup = await cursor.fetchone() is None
+            
+            await db.execute("""
+                CREATE TABLE IF NOT EXISTS daily_rollup (
+                    date TEXT NOT NULL,
+                    api_provider TEXT NOT NULL,
+                    language TEXT NOT NULL,
+                    calls INTEGER DEFAULT 0,
+                    tokens INTEGER DEFAULT 0,
+                    cost REAL DEFAULT 0.0,
+                    sum_response_time REAL DEFAULT 0.0,
+                    errors INTEGER DEFAULT 0,
+                    PRIMARY KEY (date, api_provider, language)
                 )
             """)
             
+            if new_rollup:
+                await db.execute("""
+                    INSERT INTO daily_rollup
+                    (date, api_provider, language, calls, tokens, cost, sum_response_time, errors)
+                    SELECT DATE(timestamp, 'unixepoch'), COALESCE(api_provider, ''), COALESCE(language_detected, ''),
+                           COUNT(*), COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost), 0.0),
+                           COALESCE(SUM(response_time), 0.0), SUM(NOT success)
+                    FROM interactions
+                    GROUP BY 1, 2, 3
+                """)
+            
+            async with db.execute("""
+                SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_int_ts_covering'
+            """) as cursor:
+                new_indexes = await cursor.fetchone() is None
+            
             # Create indexes for performance
             await db.execute("CREATE INDEX IF NOT EXISTS idx_interactions_user ON interactions(user_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_interactions_server ON interactions(server_id)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_interactions_timestamp ON interactions(timestamp)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_interactions_api ON interactions(api_provider)")
             await db.execute("CREATE INDEX IF NOT EXISTS idx_command_usage_command ON command_usage(command_name)")
-            await db.execute("CREATE INDEX IF NOT EXISTS idx_command_usage_timestamp ON command_usage(timestamp)")
             
+            # Covering indexes: the time-windowed stats queries range-scan
+            # these and read every column they aggregate from the index,
+            # without a table lookup per row
+            await db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_int_ts_covering ON interactions(
+                    timestamp, api_provider, language_detected, server_id, user_id,
+                    tokens_used, cost, response_time
+                )
+            """)
+            await db.execute("CREATE INDEX IF NOT EXISTS idx_cmd_ts_name ON command_usage(timestamp, command_name)")
+            
+            # Superseded by the composite indexes above; per-server user
+            # counts now come from server_stats.total_users, so nothing
+            # looks interactions up by server any more
+            await db.execute("DROP INDEX IF EXISTS idx_interactions_server")
+            await db.execute("DROP INDEX IF EXISTS idx_int_server_user")
+            await db.execute("DROP INDEX IF EXISTS idx_interactions_timestamp")
+            await db.execute("DROP INDEX IF EXISTS idx_command_usage_timestamp")
+            
+            await db.execute(f"PRAGMA user_version = {ANALYTICS_SCHEMA_VERSION}")
             await db.commit()
+            
+            # Give the planner statistics for the new indexes (once)
+            if new_indexes:
+                await db.execute("ANALYZE")
+                await db.commit()
+    
+    async def flush(self):
+        """Wait until every queued interaction and command has been written"""
+        if self._writer_task is not None and not self._writer_task.done():
+            await self._queue.join()
+    
+    async def _drain(self):
+        """
+        Background writer: collect queued events into batches and write
+        each batch in a single transaction
         
-        self._initialized = True
+        A batch closes at ANALYTICS_FLUSH_SIZE events or
+        ANALYTICS_FLUSH_INTERVAL seconds after its first event, so a burst
+        of messages costs one commit instead of one per message.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + ANALYTICS_FLUSH_INTERVAL
+            while len(batch) < ANALYTICS_FLUSH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                print(f"[ERROR] Failed to write {len(batch)} analytics events: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+    
+    async def _write_batch(self, batch: List[Tuple]):
+        """
+        Write a batch of queued interactions, their stats updates and
+        queued command uses
+        
+        Args:
+            batch: (kind, row, date) events from log_interaction() and
+                log_command()
+        """
+        interactions = [(row, today) for kind, row, today in batch if kind == "interaction"]
+        commands = [row for kind, row, _ in batch if kind == "command"]
+        
+        # Sum the batch per stats key first, so each user/server/API/
+        # language row gets one upsert per batch instead of one per event
+        user_agg = {}  # user_id -> [username, messages, tokens, cost]
+        server_agg = defaultdict(lambda: [0, 0, 0.0])  # server_id -> [messages, tokens, cost]
+        server_members = set()
+        api_agg = defaultdict(lambda: [0, 0, 0, 0.0, 0.0])  # (api, date) -> [calls, errors, tokens, cost, response time]
+        language_agg = defaultdict(int)
+        rollup_agg = defaultdict(lambda: [0, 0, 0.0, 0.0, 0])  # (date, api, language) -> [calls, tokens, cost, response time, errors]
+        for row, today in interactions:
+            (user_id, username, server_id, _channel_id, _query_text, _bot_response,
+             api_provider, response_time, tokens_used, cost, language_detected,
+             success, _error_message) = row
+            tokens_used = tokens_used or 0
+            cost = cost or 0.0
+            
+            user = user_agg.get(user_id)
+            if user is None:
+                user_agg[user_id] = [username, 1, tokens_used, cost]
+            else:
+                user[0] = username  # latest name wins, as with per-event upserts
+                user[1] += 1
+                user[2] += tokens_used
+                user[3] += cost
+            
+            if server_id:
+                server_members.add((server_id, user_id))
+                server = server_agg[server_id]
+                server[0] += 1
+                server[1] += tokens_used
+                server[2] += cost
+            
+            if api_provider:
+                api = api_agg[(api_provider, today)]
+                api[0] += 1
+                api[1] += 0 if success else 1
+                api[2] += tokens_used
+                api[3] += cost
+                api[4] += response_time or 0.0
+            
+            if language_detected:
+                language_agg[language_detected] += 1
+            
+            rollup = rollup_agg[(today, api_provider or '', language_detected or '')]
+            rollup[0] += 1
+            rollup[1] += tokens_used
+            rollup[2] += cost
+            rollup[3] += response_time or 0.0
+            rollup[4] += 0 if success else 1
+        
+        user_updates = [
+            (user_id, username, messages, tokens, cost)
+            for user_id, (username, messages, tokens, cost) in user_agg.items()
+        ]
+        server_updates = [
+            (server_id, messages, tokens, cost)
+            for server_id, (messages, tokens, cost) in server_agg.items()
+        ]
+        api_updates = [
+            (api_provider, day, calls, errors, tokens, cost, response_time)
+            for (api_provider, day), (calls, errors, tokens, cost, response_time) in api_agg.items()
+        ]
+        language_updates = list(language_agg.items())
+        rollup_updates = [key + tuple(totals) for key, totals in rollup_agg.items()]
+        
+        async with self._transaction() as db:
+            if commands:
+                await db.executemany(_INSERT_COMMAND_SQL, commands)
+            if self.store_bodies and interactions:
+                # Bodies go to interaction_bodies; the batch's ids are
+                # consecutive since this is the only writer mid-transaction
+                await db.executemany(_INSERT_INTERACTION_SQL, [
+                    row[:4] + (None, None) + row[6:] for row, _ in interactions
+                ])
+                async with db.execute("SELECT last_insert_rowid()") as cursor:
+                    first_id = (await cursor.fetchone())[0] - len(interactions) + 1
+                await db.executemany(_INSERT_INTERACTION_BODY_SQL, [
+                    (first_id + i, row[4], row[5]) for i, (row, _) in enumerate(interactions)
+                ])
+            else:
+                await db.executemany(_INSERT_INTERACTION_SQL, [
+                    row[:4] + (
+                        row[4][:ANALYTICS_BODY_PREVIEW_CHARS] if row[4] else row[4],
+                        row[5][:ANALYTICS_BODY_PREVIEW_CHARS] if row[5] else row[5],
+                    ) + row[6:]
+                    for row, _ in interactions
+                ])
+            await db.executemany(_UPSERT_USER_STATS_SQL, user_updates)
+            if server_updates:
+                await db.executemany(_UPSERT_SERVER_STATS_SQL, server_updates)
+                # After the upsert, so the trigger finds the server's row
+                await db.executemany(_INSERT_SERVER_MEMBER_SQL, server_members)
+            if api_updates:
+                await db.executemany(_UPSERT_API_USAGE_SQL, api_updates)
+            if language_updates:
+                await db.executemany(_UPSERT_LANGUAGE_USAGE_SQL, language_updates)
+            await db.executemany(_UPSERT_DAILY_ROLLUP_SQL, rollup_updates)
+            await db.commit()
     
     async def log_interaction(
         self,
@@ -146,7 +710,7 @@ class AnalyticsTracker:
         error_message: Optional[str] = None
     ):
         """
-        Log an interaction
+        Queue an interaction for the background writer
         
         Args:
             user_id: User ID
@@ -163,157 +727,97 @@ class AnalyticsTracker:
             success: Whether interaction was successful
             error_message: Error message if failed
         """
-        await self.initialize()
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO interactions 
-                (user_id, username, server_id, channel_id, query_text, bot_response,
-                 api_provider, response_time, tokens_used, cost, language_detected,
-                 success, error_message)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                user_id, username, server_id, channel_id, query_text, bot_response,
-                api_provider, response_time, tokens_used, cost, language_detected,
-                success, error_message
-            ))
-            
-            # Update user stats
-            await db.execute("""
-                INSERT INTO user_stats 
-                (user_id, username, total_messages, total_tokens, total_cost, 
-                 first_seen, last_seen)
-                VALUES (?, ?, 1, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                ON CONFLICT(user_id) DO UPDATE SET
-                    username = excluded.username,
-                    total_messages = total_messages + 1,
-                    total_tokens = total_tokens + excluded.total_tokens,
-                    total_cost = total_cost + excluded.total_cost,
-                    last_seen = CURRENT_TIMESTAMP,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (user_id, username, tokens_used, cost))
-            
-            # Update server stats if server_id provided
-            if server_id:
-                await db.execute("""
-                    INSERT INTO server_stats 
-                    (server_id, total_messages, total_tokens, total_cost,
-                     first_seen, last_seen)
-                    VALUES (?, 1, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                    ON CONFLICT(server_id) DO UPDATE SET
-                        total_messages = total_messages + 1,
-                        total_tokens = total_tokens + excluded.total_tokens,
-                        total_cost = total_cost + excluded.total_cost,
-                        last_seen = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (server_id, tokens_used, cost))
-            
-            # Update API usage
-            if api_provider:
-                today = datetime.now().date().isoformat()
-                await db.execute("""
-                    INSERT INTO api_usage 
-                    (api_provider, date, calls, errors, total_tokens, total_cost, avg_response_time)
-                    VALUES (?, ?, 1, ?, ?, ?, ?)
-                    ON CONFLICT(api_provider, date) DO UPDATE SET
-                        calls = calls + 1,
-                        errors = errors + excluded.errors,
-                        total_tokens = total_tokens + excluded.total_tokens,
-                        total_cost = total_cost + excluded.total_cost,
-                        avg_response_time = (avg_response_time * calls + excluded.avg_response_time) / (calls + 1)
-                """, (api_provider, today, 0 if success else 1, tokens_used, cost, response_time))
-            
-            # Update language usage
-            if language_detected:
-                await db.execute("""
-                    INSERT INTO language_usage 
-                    (language_code, usage_count, last_used)
-                    VALUES (?, 1, CURRENT_TIMESTAMP)
-                    ON CONFLICT(language_code) DO UPDATE SET
-                        usage_count = usage_count + 1,
-                        last_used = CURRENT_TIMESTAMP,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (language_detected,))
-            
-            await db.commit()
+        # Queued for the background writer; returns without touching the
+        # database. Days are UTC everywhere (api_usage, daily_rollup and the
+        # stats cutoffs), matching the UTC epoch timestamps.
+        today = time.strftime("%Y-%m-%d", time.gmtime())
+        self._queue.put_nowait(("interaction", (
+            user_id, username, server_id, channel_id, query_text, bot_response,
+            api_provider, response_time, tokens_used, cost, language_detected,
+            success, error_message
+        ), today))
     
     async def log_command(self, command_name: str, user_id: str, server_id: Optional[str]):
-        """Log command usage"""
-        await self.initialize()
+        """Queue a command use for the background writer (see flush())"""
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute("""
-                INSERT INTO command_usage (command_name, user_id, server_id)
-                VALUES (?, ?, ?)
-            """, (command_name, user_id, server_id))
-            await db.commit()
+        self._queue.put_nowait(("command", (command_name, user_id, server_id), None))
     
     async def get_user_stats(self, user_id: str) -> Dict:
         """Get statistics for a user"""
-        await self.initialize()
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
-                SELECT * FROM user_stats WHERE user_id = ?
+                SELECT user_id, username, total_messages, total_tokens, total_cost,
+                       preferred_language, preferred_api, first_seen, last_seen
+                FROM user_stats WHERE user_id = ?
             """, (user_id,)) as cursor:
                 row = await cursor.fetchone()
-                if not row:
-                    return {}
-                
-                return {
-                    "user_id": row[0],
-                    "username": row[1],
-                    "total_messages": row[2],
-                    "total_tokens": row[3],
-                    "total_cost": row[4],
-                    "preferred_language": row[5],
-                    "preferred_api": row[6],
-                    "first_seen": row[7],
-                    "last_seen": row[8]
-                }
+                return dict(row) if row else {}
     
     async def get_server_stats(self, server_id: str) -> Dict:
         """Get statistics for a server"""
-        await self.initialize()
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
+        async with self._connection() as db:
             async with db.execute("""
-                SELECT * FROM server_stats WHERE server_id = ?
+                SELECT server_id, server_name, total_messages, total_users, total_tokens,
+                       total_cost, first_seen, last_seen
+                FROM server_stats WHERE server_id = ?
             """, (server_id,)) as cursor:
                 row = await cursor.fetchone()
-                if not row:
-                    return {}
-                
-                # Get unique users count
-                async with db.execute("""
-                    SELECT COUNT(DISTINCT user_id) FROM interactions 
-                    WHERE server_id = ?
-                """, (server_id,)) as user_cursor:
-                    user_count = (await user_cursor.fetchone())[0]
-                
-                return {
-                    "server_id": row[0],
-                    "server_name": row[1],
-                    "total_messages": row[2],
-                    "total_users": user_count,
-                    "total_tokens": row[4],
-                    "total_cost": row[5],
-                    "first_seen": row[6],
-                    "last_seen": row[7]
-                }
+                return dict(row) if row else {}
+    
+    async def _cached_stats(self, name: str, days: int, compute) -> Dict:
+        """
+        Return a windowed stats result, recomputing it at most once per
+        STATS_CACHE_TTL seconds for each (name, days)
+        
+        Args:
+            name: Cache key for the stats method
+            days: Window size in days
+            compute: Coroutine function computing the stats for days
+            
+        Returns:
+            Stats dictionary (a copy, so callers may modify it)
+        """
+        key = (name, days)
+        cached = self._stats_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < STATS_CACHE_TTL:
+            return dict(cached[1])
+        
+        stats = await compute(days)
+        self._stats_cache[key] = (time.monotonic(), stats)
+        return dict(stats)
     
     async def get_global_stats(self, days: int = 30) -> Dict:
-        """Get global statistics"""
-        await self.initialize()
+        """Get global statistics (cached for STATS_CACHE_TTL seconds)"""
+        return await self._cached_stats("global", days, self._query_global_stats)
+    
+    async def _query_global_stats(self, days: int) -> Dict:
+        """Compute global statistics from the database"""
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        async with self._connection() as db:
+            cutoff = int(time.time()) - days * 86400
+            cutoff_day = time.strftime("%Y-%m-%d", time.gmtime(cutoff))
+            
+            # Totals, API and language breakdowns come from daily_rollup
+            # (whole days); distinct users/servers need the interactions
             
             # Total interactions
             async with db.execute("""
-                SELECT COUNT(*), SUM(tokens_used), SUM(cost), AVG(response_time)
-                FROM interactions WHERE timestamp >= ?
-            """, (cutoff_date,)) as cursor:
+                SELECT SUM(calls), SUM(tokens), SUM(cost), SUM(sum_response_time) / SUM(calls)
+                FROM daily_rollup WHERE date >= ?
+            """, (cutoff_day,)) as cursor:
                 row = await cursor.fetchone()
                 total_interactions = row[0] or 0
                 total_tokens = row[1] or 0
@@ -323,23 +827,23 @@ class AnalyticsTracker:
             # Unique users
             async with db.execute("""
                 SELECT COUNT(DISTINCT user_id) FROM interactions WHERE timestamp >= ?
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff,)) as cursor:
                 unique_users = (await cursor.fetchone())[0] or 0
             
             # Unique servers
             async with db.execute("""
                 SELECT COUNT(DISTINCT server_id) FROM interactions 
                 WHERE server_id IS NOT NULL AND timestamp >= ?
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff,)) as cursor:
                 unique_servers = (await cursor.fetchone())[0] or 0
             
             # API breakdown
             async with db.execute("""
-                SELECT api_provider, COUNT(*), SUM(cost), AVG(response_time)
-                FROM interactions 
-                WHERE timestamp >= ? AND api_provider IS NOT NULL
+                SELECT api_provider, SUM(calls), SUM(cost), SUM(sum_response_time) / SUM(calls)
+                FROM daily_rollup 
+                WHERE date >= ? AND api_provider != ''
                 GROUP BY api_provider
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff_day,)) as cursor:
                 api_breakdown = {}
                 async for row in cursor:
                     api_breakdown[row[0]] = {
@@ -350,13 +854,13 @@ class AnalyticsTracker:
             
             # Language distribution
             async with db.execute("""
-                SELECT language_detected, COUNT(*) 
-                FROM interactions 
-                WHERE timestamp >= ? AND language_detected IS NOT NULL
-                GROUP BY language_detected
-                ORDER BY COUNT(*) DESC
+                SELECT language, SUM(calls) 
+                FROM daily_rollup 
+                WHERE date >= ? AND language != ''
+                GROUP BY language
+                ORDER BY SUM(calls) DESC
                 LIMIT 10
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff_day,)) as cursor:
                 language_dist = {}
                 async for row in cursor:
                     language_dist[row[0]] = row[1]
@@ -369,7 +873,7 @@ class AnalyticsTracker:
                 GROUP BY command_name
                 ORDER BY COUNT(*) DESC
                 LIMIT 10
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff,)) as cursor:
                 top_commands = {}
                 async for row in cursor:
                     top_commands[row[0]] = row[1]
@@ -398,43 +902,36 @@ class AnalyticsTracker:
         Returns:
             List of (user_id, value) tuples
         """
-        await self.initialize()
-        
-        column_map = {
-            "messages": "total_messages",
-            "tokens": "total_tokens",
-            "cost": "total_cost"
-        }
+        if not self._initialized:
+            await self.initialize()
         
-        column = column_map.get(category, "total_messages")
+        sql = _LEADERBOARD_SQL.get(category, _LEADERBOARD_SQL["messages"])
         
-        async with aiosqlite.connect(self.db_path) as db:
-            async with db.execute(f"""
-                SELECT user_id, {column} 
-                FROM user_stats 
-                ORDER BY {column} DESC 
-                LIMIT ?
-            """, (limit,)) as cursor:
-                results = []
-                async for row in cursor:
-                    results.append((row[0], row[1]))
-                return results
+        async with self._connection() as db:
+            rows = await db.execute_fetchall(sql, (limit,))
+            return [(row[0], row[1]) for row in rows]
     
     async def get_cost_analytics(self, days: int = 30) -> Dict:
-        """Get cost analytics"""
-        await self.initialize()
+        """Get cost analytics (cached for STATS_CACHE_TTL seconds)"""
+        return await self._cached_stats("cost", days, self._query_cost_analytics)
+    
+    async def _query_cost_analytics(self, days: int) -> Dict:
+        """Compute cost analytics from the database"""
+        if not self._initialized:
+            await self.initialize()
         
-        async with aiosqlite.connect(self.db_path) as db:
-            cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        async with self._connection() as db:
+            cutoff_day = time.strftime("%Y-%m-%d", time.gmtime(time.time() - days * 86400))
             
             # Daily costs
             async with db.execute("""
-                SELECT DATE(timestamp) as date, SUM(cost) as daily_cost
-                FROM interactions
-                WHERE timestamp >= ? AND cost > 0
-                GROUP BY DATE(timestamp)
+                SELECT date, SUM(cost) as daily_cost
+                FROM daily_rollup
+                WHERE date >= ?
+                GROUP BY date
+                HAVING SUM(cost) > 0
                 ORDER BY date DESC
-            """, (cutoff_date,)) as cursor:
+            """, (cutoff_day,)) as cursor:
                 daily_costs = {}
                 async for row in cursor:
                     daily_costs[row[0]] = row[1] or 0.0
@@ -442,10 +939,11 @@ class AnalyticsTracker:
             # API costs
             async with db.execute("""
                 SELECT api_provider, SUM(cost) as total_cost
-                FROM interactions
-                WHERE timestamp >= ? AND api_provider IS NOT NULL AND cost > 0
+                FROM daily_rollup
+                WHERE date >= ? AND api_provider != ''
                 GROUP BY api_provider
-            """, (cutoff_date,)) as cursor:
+                HAVING SUM(cost) > 0
+            """, (cutoff_day,)) as cursor:
                 api_costs = {}
                 async for row in cursor:
                     api_costs[row[0]] = row[1] or 0.0
@@ -5,10 +5,72 @@ Handles all API calls and response formatting
 
 import os
 import asyncio
-from typing import Optional, Dict, List
+from types import MappingProxyType
+from typing import AsyncIterator, Optional, Dict, List
+import httpx
 from openai import AsyncOpenAI
 from anthropic import AsyncAnthropic
 
+# Requests in flight to the AI provider at once, across every APIHandler;
+# bursts queue here instead of tripping the provider's rate limit
+API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", "16"))
+_api_semaphore = asyncio.Semaphore(API_CONCURRENCY)
+
+# Connection pool for the shared API clients; keep-alive connections skip
+# a TLS handshake per request
+API_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+
+# One client per (provider, API key) for the whole process, so every
+# APIHandler (one per cog) shares its connection pool
+_clients: Dict[tuple, object] = {}
+
+
+def _get_client(provider: str, api_key: str):
+    """
+    Get the process-wide client for a provider, creating it on first use
+    
+    Args:
+        provider: 'openai' or 'anthropic'
+        api_key: API key for the provider
+        
+    Returns:
+        AsyncOpenAI or AsyncAnthropic client
+    """
+    key = (provider, api_key)
+    client = _clients.get(key)
+    if client is None:
+        client_class = AsyncOpenAI if provider == "openai" else AsyncAnthropic
+        client = client_class(
+            api_key=api_key,
+            http_client=httpx.AsyncClient(limits=API_HTTP_LIMITS)
+        )
+        _clients[key] = client
+    return client
+
+# System prompts by personality, built once at import
+PERSONALITY_PROMPTS = MappingProxyType({
+    "friendly": (
+        "You are a friendly and conversational AI assistant in a Discord server. "
+        "Be warm, approachable, and engaging. Use casual language when appropriate, "
+        "but remain helpful and informative. Show genuine interest in conversations."
+    ),
+    "professional": (
+        "You are a professional AI assistant in a Discord server. "
+        "Be courteous, precise, and maintain a formal tone. Provide clear, "
+        "well-structured responses. Focus on accuracy and helpfulness."
+    ),
+    "funny": (
+        "You are a humorous and entertaining AI assistant in a Discord server. "
+        "Be witty, use humor appropriately, and keep conversations light-hearted. "
+        "Make jokes when suitable, but still be helpful and informative."
+    ),
+    "helpful": (
+        "You are a helpful and knowledgeable AI assistant in a Discord server. "
+        "Focus on providing clear, accurate answers. Be patient and thorough. "
+        "Break down complex topics and offer step-by-step guidance when needed."
+    )
+})
+
 
 class APIHandler:
     """Handles API calls to OpenAI or Anthropic Claude"""
@@ -24,13 +86,13 @@ class APIHandler:
             api_key = os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not found in environment variables")
-            self.openai_client = AsyncOpenAI(api_key=api_key)
+            self.openai_client = _get_client("openai", api_key)
         else:
             # Initialize Anthropic client
             api_key = os.getenv("ANTHROPIC_API_KEY")
             if not api_key:
                 raise ValueError("ANTHROPIC_API_KEY not found in environment variables")
-            self.anthropic_client = AsyncAnthropic(api_key=api_key)
+            self.anthropic_client = _get_client("anthropic", api_key)
     
     async def generate_response(
         self,
@@ -54,10 +116,42 @@ class APIHandler:
             system_prompt = self._get_personality_prompt(personality)
         
         try:
-            if self.use_openai:
-                return await self._generate_openai_response(messages, system_prompt)
-            else:
-                return await self._generate_anthropic_response(messages, system_prompt)
+            async with _api_semaphore:
+                if self.use_openai:
+                    return await self._generate_openai_response(messages, system_prompt)
+                else:
+                    return await self._generate_anthropic_response(messages, system_prompt)
+        except Exception as e:
+            raise Exception(f"API Error: {str(e)}")
+    
+    async def generate_response_stream(
+        self,
+        messages: List[Dict[str, str]],
+        personality: str = "friendly",
+        system_prompt: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream an AI response, yielding text as the model produces it
+        
+        Args:
+            messages: List of message dicts with 'role' and 'content'
+            personality: Bot personality (friendly, professional, funny, helpful)
+            system_prompt: Optional custom system prompt
+            
+        Yields:
+            Response text fragments, in order
+        """
+        if system_prompt is None:
+            system_prompt = self._get_personality_prompt(personality)
+        
+        try:
+            async with _api_semaphore:
+                if self.use_openai:
+                    stream = self._stream_openai_response(messages, system_prompt)
+                else:
+                    stream = self._stream_anthropic_response(messages, system_prompt)
+                async for text in stream:
+                    yield text
         except Exception as e:
             raise Exception(f"API Error: {str(e)}")
     
@@ -80,6 +174,27 @@ class APIHandler:
         
         return response.choices[0].message.content.strip()
     
+    async def _stream_openai_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str
+    ) -> AsyncIterator[str]:
+        """Stream response text from the OpenAI API"""
+        formatted_messages = [{"role": "system", "content": system_prompt}]
+        formatted_messages.extend(messages)
+        
+        stream = await self.openai_client.chat.completions.create(
+            model=self.openai_model,
+            messages=formatted_messages,
+            temperature=0.7,
+            max_tokens=1000,
+            stream=True
+        )
+        
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    
     async def _generate_anthropic_response(
         self,
         messages: List[Dict[str, str]],
@@ -90,12 +205,32 @@ class APIHandler:
         response = await self.anthropic_client.messages.create(
             model=self.anthropic_model,
             max_tokens=1000,
-            system=system_prompt,
+            system=self._anthropic_system(system_prompt),
             messages=messages
         )
         
         return response.content[0].text.strip()
     
+    async def _stream_anthropic_response(
+        self,
+        messages: List[Dict[str, str]],
+        system_prompt: str
+    ) -> AsyncIterator[str]:
+        """Stream response text from the Anthropic Claude API"""
+        async with self.anthropic_client.messages.stream(
+            model=self.anthropic_model,
+            max_tokens=1000,
+            system=self._anthropic_system(system_prompt),
+            messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+    
+    @staticmethod
+    def _anthropic_system(system_prompt: str) -> List[Dict]:
+        """Wrap a system prompt as a content block marked for prompt caching"""
+        return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+    
     def _get_personality_prompt(self, personality: str) -> str:
         """
         Get system prompt based on personality type
@@ -106,30 +241,7 @@ class APIHandler:
         Returns:
             System prompt string
         """
-        prompts = {
-            "friendly": (
-                "You are a friendly and conversational AI assistant in a Discord server. "
-                "Be warm, approachable, and engaging. Use casual language when appropriate, "
-                "but remain helpful and informative. Show genuine interest in conversations."
-            ),
-            "professional": (
-                "You are a professional AI assistant in a Discord server. "
-                "Be courteous, precise, and maintain a formal tone. Provide clear, "
-                "well-structured responses. Focus on accuracy and helpfulness."
-            ),
-            "funny": (
-                "You are a humorous and entertaining AI assistant in a Discord server. "
-                "Be witty, use humor appropriately, and keep conversations light-hearted. "
-                "Make jokes when suitable, but still be helpful and informative."
-            ),
-            "helpful": (
-                "You are a helpful and knowledgeable AI assistant in a Discord server. "
-                "Focus on providing clear, accurate answers. Be patient and thorough. "
-                "Break down complex topics and offer step-by-step guidance when needed."
-            )
-        }
-        
-        return prompts.get(personality.lower(), prompts["friendly"])
+        return PERSONALITY_PROMPTS.get(personality.lower(), PERSONALITY_PROMPTS["friendly"])
     
     async def summarize_conversation(self, messages: List[Dict[str, str]]) -> str:
         """
@@ -139,19 +251,23 @@ class APIHandler:
             messages: List of conversation messages
             
         Returns:
-            Summary text
+            Summary text (the messages themselves if there are fewer than 3)
         """
+        recent = messages[-20:]
+        if len(recent) < 3:
+            return "\n".join(f"{msg['role']}: {msg['content']}" for msg in recent)
+        
         summary_prompt = (
-            "Please provide a brief summary of the following conversation. "
+            "Please provide a brief summary of the conversation above. "
             "Highlight the main topics discussed and key points."
         )
         
+        # Send the conversation as real turns, followed by the instruction
         summary_messages = [
-            {"role": "user", "content": summary_prompt},
-            {"role": "user", "content": "\n".join([
-                f"{msg['role']}: {msg['content']}" for msg in messages[-20:]
-            ])}
+            {"role": "user" if msg["role"] == "system" else msg["role"], "content": msg["content"]}
+            for msg in recent
         ]
+        summary_messages.append({"role": "user", "content": summary_prompt})
         
         return await self.generate_response(
             summary_messages,
@@ -8,9 +8,12 @@ import asyncio
 import time
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
+from collections import OrderedDict
 from enum import Enum
 import json
 import hashlib
+import re
+from functools import lru_cache
 
 # API Provider Imports
 try:
@@ -58,6 +61,83 @@ class QueryType(Enum):
     TRANSLATION = "translation"  # Translation tasks
 
 
+def _keyword_re(keywords: List[str]) -> "re.Pattern":
+    """Compile keywords into one whole-word alternation, scanned in a single pass"""
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keywords) + r")\b")
+
+
+# Routing keywords for _classify_query, compiled once at import
+_SIMPLE_RE = _keyword_re([
+    "hello", "hi", "hey", "thanks", "thank you", "bye", "goodbye",
+    "how are you", "what's up", "sup"
+])
+
+# "ترجم" is the Arabic root, so it also matches as a prefix (ترجمة, ...)
+_TRANSLATION_RE = re.compile(r"\b(?:translate|translation|wergêre)\b|ترجم")
+
+_REASONING_RE = _keyword_re([
+    # Math
+    "calculate", "solve", "equation", "math", "mathematical", "algebra", "calculus",
+    "derivative", "integral", "differential", "solve for", "find x", "prove",
+    "theorem", "formula", "quadratic", "polynomial", "matrix", "vector",
+    # Logic & Reasoning
+    "reasoning", "logic", "puzzle", "riddle", "step by step", "think through",
+    "reason about", "logical", "deduce", "infer", "conclusion",
+    # Coding & Algorithms
+    "algorithm", "data structure", "complexity", "optimize", "debug", "trace",
+    "binary search", "sorting", "recursion", "dynamic programming",
+    # Problem-solving
+    "how to solve", "figure out", "determine", "analyze step by step",
+    "break down", "work through"
+])
+
+_COMPLEX_RE = _keyword_re([
+    "explain", "analyze", "code", "program", "implement",
+    "how does", "why", "compare", "difference"
+])
+
+_CODING_RE = _keyword_re(["code", "program", "implement", "algorithm", "debug"])
+
+
+@lru_cache(maxsize=4096)
+def _classify_query_cached(query_lower: str) -> QueryType:
+    """
+    Classify a lowercased, stripped query (memoized, since the same short
+    messages - greetings, thanks - keep coming back)
+    
+    Args:
+        query_lower: Normalized user query text
+        
+    Returns:
+        QueryType enum
+    """
+    # Simple queries (greetings, basic questions)
+    if _SIMPLE_RE.search(query_lower):
+        return QueryType.SIMPLE
+    
+    # Translation queries
+    if _TRANSLATION_RE.search(query_lower):
+        return QueryType.TRANSLATION
+    
+    # Reasoning queries (math, logic, step-by-step) - Route to DeepSeek R1
+    if _REASONING_RE.search(query_lower):
+        return QueryType.REASONING
+    
+    # Complex queries (analysis, coding, writing - but not pure reasoning)
+    if _COMPLEX_RE.search(query_lower):
+        # If it's clearly coding-related, prefer reasoning
+        if _CODING_RE.search(query_lower):
+            return QueryType.REASONING
+        return QueryType.COMPLEX
+    
+    # Speed critical (short questions that need fast answers)
+    if len(query_lower) < 50 and "?" in query_lower:
+        return QueryType.SPEED_CRITICAL
+    
+    # Default to complex for safety
+    return QueryType.COMPLEX
+
+
 class APIManager:
     """Manages multiple AI API providers with intelligent routing"""
     
@@ -83,6 +163,15 @@ class APIManager:
         self.cost_optimization = os.getenv("COST_OPTIMIZATION", "true").lower() == "true"
         self.monthly_budget = float(os.getenv("MONTHLY_BUDGET", "50"))
         
+        # Exact-match response cache: key -> (stored at, result), in LRU order
+        self._response_cache: OrderedDict[str, Tuple[float, Dict]] = OrderedDict()
+        self._cache_ttl = 3600
+        self._cache_max_size = 1000
+        
+        # (hash, time) of the last system prompt that wrote Claude's prompt
+        # cache, to spot prompts that should have been cache hits
+        self._last_claude_cache_write: Optional[Tuple[str, float]] = None
+        
         # Initialize providers
         print("[INFO] Initializing Multi-API Manager...")
         self._init_claude()
@@ -293,53 +382,7 @@ class APIManager:
         Returns:
             QueryType enum
         """
-        query_lower = query.lower()
-        
-        # Simple queries (greetings, basic questions)
-        simple_keywords = ["hello", "hi", "hey", "thanks", "thank you", "bye", "goodbye", 
-                          "how are you", "what's up", "sup"]
-        if any(keyword in query_lower for keyword in simple_keywords):
-            return QueryType.SIMPLE
-        
-        # Translation queries
-        if any(word in query_lower for word in ["translate", "translation", "ترجم", "wergêre"]):
-            return QueryType.TRANSLATION
-        
-        # Reasoning queries (math, logic, step-by-step) - Route to DeepSeek R1
-        reasoning_keywords = [
-            # Math
-            "calculate", "solve", "equation", "math", "mathematical", "algebra", "calculus",
-            "derivative", "integral", "differential", "solve for", "find x", "prove",
-            "theorem", "formula", "quadratic", "polynomial", "matrix", "vector",
-            # Logic & Reasoning
-            "reasoning", "logic", "puzzle", "riddle", "step by step", "think through",
-            "reason about", "logical", "deduce", "infer", "conclusion",
-            # Coding & Algorithms
-            "algorithm", "data structure", "complexity", "optimize", "debug", "trace",
-            "binary search", "sorting", "recursion", "dynamic programming",
-            # Problem-solving
-            "how to solve", "figure out", "determine", "analyze step by step",
-            "break down", "work through"
-        ]
-        if any(keyword in query_lower for keyword in reasoning_keywords):
-            return QueryType.REASONING
-        
-        # Complex queries (analysis, coding, writing - but not pure reasoning)
-        complex_keywords = ["explain", "analyze", "code", "program", "implement",
-                           "how does", "why", "compare", "difference"]
-        if any(keyword in query_lower for keyword in complex_keywords):
-            # If it's clearly coding-related, prefer reasoning
-            coding_keywords = ["code", "program", "implement", "algorithm", "debug"]
-            if any(keyword in query_lower for keyword in coding_keywords):
-                return QueryType.REASONING
-            return QueryType.COMPLEX
-        
-        # Speed critical (short questions that need fast answers)
-        if len(query) < 50 and "?" in query:
-            return QueryType.SPEED_CRITICAL
-        
-        # Default to complex for safety
-        return QueryType.COMPLEX
+        return _classify_query_cached(query.lower().strip())
     
     def _get_provider_for_query(self, query_type: QueryType, has_image: bool = False) -> Optional[APIProvider]:
         """
@@ -456,14 +499,25 @@ class APIManager:
         # Filter to only available providers
         return [p for p in chain if p in self.providers]
     
-    def _calculate_cost(self, provider: APIProvider, input_tokens: int, output_tokens: int) -> float:
+    def _calculate_cost(
+        self,
+        provider: APIProvider,
+        input_tokens: int,
+        output_tokens: int,
+        cache_read_tokens: int = 0,
+        cache_write_tokens: int = 0
+    ) -> float:
         """
         Calculate cost for API call
         
         Args:
             provider: API provider
-            input_tokens: Input tokens used
+            input_tokens: Input tokens used (excluding prompt-cache tokens)
             output_tokens: Output tokens used
+            cache_read_tokens: Input tokens read from the prompt cache
+                (billed at 10% of the input rate)
+            cache_write_tokens: Input tokens written to the prompt cache
+                (billed at 125% of the input rate)
             
         Returns:
             Cost in USD
@@ -480,11 +534,47 @@ class APIManager:
         if provider not in pricing:
             return 0.0
         
-        cost = (input_tokens / 1_000_000 * pricing[provider]["input"] + 
+        billed_input = input_tokens + cache_read_tokens * 0.1 + cache_write_tokens * 1.25
+        cost = (billed_input / 1_000_000 * pricing[provider]["input"] + 
                 output_tokens / 1_000_000 * pricing[provider]["output"])
         
         return cost
     
+    def _cache_key(
+        self,
+        provider: APIProvider,
+        messages: List[Dict[str, str]],
+        system_prompt: str,
+        detected_language: Optional[str],
+        kwargs: Dict
+    ) -> str:
+        """
+        Build the response cache key for a request
+        
+        Message text is lowercased and whitespace-collapsed, so trivially
+        different phrasings of the same prompt share an entry.
+        
+        Args:
+            provider: Provider the request is routed to
+            messages: Conversation messages
+            system_prompt: System prompt
+            detected_language: Detected language
+            kwargs: Generation parameters (temperature, max_tokens, ...)
+            
+        Returns:
+            SHA-256 hex digest
+        """
+        normalized = [
+            [m.get("role"), " ".join(str(m.get("content", "")).lower().split())]
+            for m in messages
+        ]
+        payload = json.dumps(
+            [provider.value, system_prompt, detected_language, normalized, kwargs],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
     async def generate_response(
         self,
         messages: List[Dict[str, str]],
@@ -493,6 +583,7 @@ class APIManager:
         detected_language: Optional[str] = None,
         has_image: bool = False,
         query: Optional[str] = None,
+        use_cache: bool = True,
         **kwargs
     ) -> Dict[str, any]:
         """
@@ -505,6 +596,8 @@ class APIManager:
             detected_language: Detected language
             has_image: Whether query includes image
             query: User query text (for routing)
+            use_cache: Reuse the response to an identical earlier request
+                (pass False when every call should produce fresh output)
             **kwargs: Additional parameters
             
         Returns:
@@ -563,6 +656,22 @@ class APIManager:
                     elif APIProvider.GROQ in self.providers:
                         primary_provider = APIProvider.GROQ
         
+        # Identical recent request: answer from the cache, skipping the API
+        cache_key = None
+        if use_cache and not has_image:
+            cache_key = self._cache_key(primary_provider, messages, system_prompt, detected_language, kwargs)
+            cached = self._response_cache.get(cache_key)
+            if cached is not None:
+                stored_at, cached_result = cached
+                if time.time() - stored_at < self._cache_ttl:
+                    self._response_cache.move_to_end(cache_key)
+                    result = dict(cached_result)
+                    result["cost"] = 0.0
+                    result["response_time"] = time.time() - start_time
+                    result["cached"] = True
+                    return result
+                del self._response_cache[cache_key]
+        
         # Try primary provider with fallback chain
         providers_to_try = [primary_provider]
         if self.enable_fallback:
@@ -588,7 +697,9 @@ class APIManager:
                 cost = self._calculate_cost(
                     provider,
                     result.get("input_tokens", 0),
-                    result.get("output_tokens", 0)
+                    result.get("output_tokens", 0),
+                    result.get("cache_read_input_tokens", 0),
+                    result.get("cache_creation_input_tokens", 0)
                 )
                 
                 # Update stats
@@ -611,6 +722,12 @@ class APIManager:
                     provider_name = provider.value.capitalize()
                     print(f"[DEBUG] {provider_name} API success! Response length: {len(result.get('response', ''))}")
                 
+                if cache_key is not None:
+                    self._response_cache[cache_key] = (time.time(), dict(result))
+                    self._response_cache.move_to_end(cache_key)
+                    if len(self._response_cache) > self._cache_max_size:
+                        self._response_cache.popitem(last=False)
+                
                 return result
                 
             except Exception as e:
@@ -678,21 +795,55 @@ class APIManager:
         """Call Claude API"""
         client = self.providers[APIProvider.CLAUDE]
         
+        # Prompt caching: the system prompt and the history up to the
+        # previous user turn are the same from one turn to the next, so
+        # both get a cache breakpoint and are billed at the cached rate
+        system = system_prompt
+        if system_prompt:
+            system = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+        
+        user_turns = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+        if len(user_turns) >= 2:
+            messages = list(messages)
+            i = user_turns[-2]
+            content = messages[i]["content"]
+            if isinstance(content, str):
+                blocks = [{"type": "text", "text": content}]
+            else:
+                blocks = [dict(block) for block in content]
+            blocks[-1]["cache_control"] = {"type": "ephemeral"}
+            messages[i] = {**messages[i], "content": blocks}
+        
         response = await client.messages.create(
             model="claude-3-5-haiku-20241022",
             max_tokens=kwargs.get("max_tokens", 300),
             temperature=kwargs.get("temperature", 0.7),
-            system=system_prompt,
-            messages=messages
+            system=system,
+            messages=messages,
+            extra_headers={"anthropic-beta": "prompt-caching-2024-07-31"}
         )
         
         response_text = response.content[0].text.strip()
+        cache_read = getattr(response.usage, "cache_read_input_tokens", None) or 0
+        cache_write = getattr(response.usage, "cache_creation_input_tokens", None) or 0
+        
+        # Writing the cache again for a system prompt written moments ago
+        # means something ahead of it changed and every call pays full price
+        if cache_write:
+            prompt_hash = hashlib.sha256(system_prompt.encode()).hexdigest()
+            now = time.time()
+            last = self._last_claude_cache_write
+            if not cache_read and last and last[0] == prompt_hash and now - last[1] < 300:
+                print("[WARNING] Claude prompt cache missed on an unchanged system prompt; check what precedes it in the request")
+            self._last_claude_cache_write = (prompt_hash, now)
         
         return {
             "response": response_text,
             "success": True,
             "input_tokens": response.usage.input_tokens,
-            "output_tokens": response.usage.output_tokens
+            "output_tokens": response.usage.output_tokens,
+            "cache_read_input_tokens": cache_read,
+            "cache_creation_input_tokens": cache_write
         }
     
     async def _call_gemini(
@@ -11,6 +11,7 @@ ARCHITECTURE:
 import sqlite3
 import json
 import asyncio
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
@@ -35,6 +36,12 @@ class MemoryManager:
         """
         self.db_path = db_path
         self.short_term_limit = short_term_limit
+        
+        # Short-lived cache for user facts: {(user_id, channel_id): (expires_at, facts)}
+        self._facts_cache: Dict[Tuple[str, str], Tuple[float, List[Dict[str, any]]]] = {}
+        self._facts_cache_ttl = 30.0
+        self._facts_cache_max_size = 1024
+        
         self._ensure_db_exists()
     
     def _ensure_db_exists(self):
@@ -194,6 +201,60 @@ class MemoryManager:
         
         return message_id
     
+    def add_messages(
+        self,
+        user_id: str,
+        channel_id: str,
+        messages: List[Tuple[str, str]]
+    ) -> int:
+        """
+        Add several messages to the conversation history in one transaction
+        
+        Args:
+            user_id: Discord user ID (required for isolation)
+            channel_id: Discord channel ID (or DM channel ID)
+            messages: List of (role, content) tuples in chronological order
+            
+        Returns:
+            Number of messages stored
+        """
+        if not user_id or not channel_id:
+            raise ValueError("user_id and channel_id are required for memory isolation")
+        
+        if any(role not in ['user', 'assistant'] for role, _ in messages):
+            raise ValueError("role must be 'user' or 'assistant'")
+        
+        if not messages:
+            return 0
+        
+        user_id = str(user_id)
+        channel_id = str(channel_id)
+        
+        from utils.importance_scorer import ImportanceScorer
+        rows = [
+            (
+                user_id,
+                channel_id,
+                role,
+                content,
+                ImportanceScorer.score_message({"role": role, "content": content}, is_user_message=(role == "user"))
+            )
+            for role, content in messages
+        ]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.executemany("""
+            INSERT INTO conversations (user_id, channel_id, role, content, importance_score)
+            VALUES (?, ?, ?, ?, ?)
+        """, rows)
+        
+        conn.commit()
+        conn.close()
+        
+        return len(rows)
+    
     def get_recent_messages(
         self,
         user_id: str,
@@ -245,6 +306,54 @@ class MemoryManager:
         
         return messages
     
+    def get_recent_messages_api_format(
+        self,
+        user_id: str,
+        channel_id: str,
+        limit: Optional[int] = None
+    ) -> Tuple[List[Dict[str, str]], Optional[Tuple[str, str]]]:
+        """
+        Get recent messages already shaped for an API call
+        
+        Args:
+            user_id: Discord user ID
+            channel_id: Discord channel ID
+            limit: Maximum number of messages (defaults to short_term_limit)
+            
+        Returns:
+            Tuple of (messages, time_range): messages are dicts with only
+            'role' and 'content' in chronological order; time_range is
+            (first_timestamp, last_timestamp), or None if there are no messages
+        """
+        if limit is None:
+            limit = self.short_term_limit
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT role, content, timestamp
+            FROM conversations
+            WHERE user_id = ? AND channel_id = ?
+            ORDER BY timestamp DESC
+            LIMIT ?
+        """, (str(user_id), str(channel_id), limit))
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        if not rows:
+            return [], None
+        
+        # Reverse to get chronological order (oldest first)
+        rows.reverse()
+        messages = [{"role": role, "content": content} for role, content, _ in rows]
+        
+        # Update last_accessed timestamp
+        self._update_last_accessed(user_id, channel_id, "conversations")
+        
+        return messages, (rows[0][2], rows[-1][2])
+    
     def get_summaries(
         self,
         user_id: str,
@@ -749,6 +858,59 @@ class MemoryManager:
             return result[0]
         return default_value
     
+    def get_all_user_facts(
+        self,
+        user_id: str,
+        channel_id: str
+    ) -> List[Dict[str, any]]:
+        """
+        Get all stored facts for a user, most important first
+        
+        Results are cached for a few seconds so back-to-back requests from
+        the same user skip the database.
+        
+        Args:
+            user_id: Discord user ID
+            channel_id: Discord channel ID
+            
+        Returns:
+            List of fact dicts with 'fact_key', 'fact_value' and 'importance_score'
+        """
+        cache_key = (str(user_id), str(channel_id))
+        now = time.monotonic()
+        cached = self._facts_cache.get(cache_key)
+        if cached and cached[0] > now:
+            return cached[1]
+        
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        
+        cursor.execute("""
+            SELECT fact_key, fact_value, importance_score
+            FROM user_facts
+            WHERE user_id = ? AND channel_id = ?
+            ORDER BY importance_score DESC, updated_at DESC
+        """, cache_key)
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        facts = [
+            {
+                "fact_key": row[0],
+                "fact_value": row[1],
+                "importance_score": row[2]
+            }
+            for row in rows
+        ]
+        
+        # Drop the whole cache rather than tracking LRU order; entries are cheap to rebuild
+        if len(self._facts_cache) >= self._facts_cache_max_size:
+            self._facts_cache.clear()
+        self._facts_cache[cache_key] = (now + self._facts_cache_ttl, facts)
+        
+        return facts
+    
     def export_summaries_to_csv(
         self,
         output_path: str = "summaries_export.csv",